@@ -0,0 +1,64 @@
+# benchmarks/bench_indeed_parsers.py
+#
+# Compares per-page parse time of the Indeed parser backends.
+#
+#   python -m benchmarks.bench_indeed_parsers                  # synthetic pages
+#   python -m benchmarks.bench_indeed_parsers --pages saved/   # saved *.html pages
+
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from benchmarks.fixtures import indeed_pages
+from src.utils.indeed_parsers import BeautifulSoupParser, LxmlParser, lxml
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench(parser, pages, repeat):
+    timings = []
+    cards = 0
+    for _ in range(repeat):
+        for page in pages:
+            started = time.perf_counter()
+            parsed, _, _ = parser.parse(page)
+            timings.append(time.perf_counter() - started)
+            cards += len(parsed)
+    return timings, cards // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", help="directory of saved Indeed result pages (*.html)")
+    parser.add_argument("--count", type=int, default=20, help="synthetic pages to generate when --pages is not given")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages) if args.pages else indeed_pages(args.count * 10)
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KiB each on average")
+
+    backends = [BeautifulSoupParser()]
+    if lxml is not None:
+        backends.append(LxmlParser())
+    else:
+        print("lxml is not installed; only timing BeautifulSoup")
+
+    baseline = None
+    for backend in backends:
+        timings, cards = bench(backend, pages, args.repeat)
+        median = statistics.median(timings) * 1000
+        baseline = baseline or median
+        print(f"{backend.name:>6}: median {median:7.2f} ms/page, p95 {sorted(timings)[int(len(timings) * 0.95)] * 1000:7.2f} ms/page, "
+              f"{cards} cards, {baseline / median:4.1f}x vs bs4")
+
+
+if __name__ == "__main__":
+    main()
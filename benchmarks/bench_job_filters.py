@@ -0,0 +1,85 @@
+# benchmarks/bench_job_filters.py
+#
+# Compares the compiled JobFilter with the per-card keyword and location
+# checks parse_job_cards used before it, and checks both keep the same cards.
+#
+#   python -m benchmarks.bench_job_filters
+#   python -m benchmarks.bench_job_filters --count 200000 --keywords data engineer --states CA NY TX
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.fixtures import synthetic_postings
+from src.utils.job_filters import JobFilter
+
+LOCATIONS = [
+    "Remote", "Austin, TX 78701", "Remote in New York, NY", "Hybrid work in San Jose, CA 95134",
+    "Chicago, IL", "Columbus, OH 43215", "Denver, CO", "Seattle, WA 98101", "United States",
+    "Boston, MA 02110", "Atlanta, GA", "Hybrid work in Miami, FL 33131", "Phoenix, AZ",
+]
+TITLE_PREFIXES = ["", "Senior ", "Lead ", "Staff ", "Principal ", "Junior "]
+TITLE_SUFFIXES = ["", " (Remote)", " - Hybrid", " II", " III", " - Contract"]
+
+
+def is_location_valid(location, excluded_states):
+    # The check parse_job_cards used to run for every card.
+    try:
+        jl_subs = [x.strip() for x in location.split(",")]
+        jl_subs = [sub_elem for elem in jl_subs for sub_elem in elem.split() if sub_elem]
+    except:
+        jl_subs = []
+    return not any(state in jl_subs for state in excluded_states)
+
+
+def legacy_filter(postings, required_keywords, states_to_exclude):
+    return [
+        job for job in postings
+        if all(keyword.lower() in job['job_title'].lower() for keyword in required_keywords)
+        and is_location_valid(job['job_location'], states_to_exclude)
+    ]
+
+
+def varied_postings(count, seed=0):
+    rng = random.Random(seed)
+    postings = synthetic_postings(count, seed=seed)
+    for job in postings:
+        job['job_title'] = f"{rng.choice(TITLE_PREFIXES)}{job['job_title']}{rng.choice(TITLE_SUFFIXES)}"
+        job['job_location'] = rng.choice(LOCATIONS)
+    return postings
+
+
+def bench(run, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        kept = run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), kept
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000, help="postings to filter")
+    parser.add_argument("--keywords", nargs="+", default=["data", "engineer"])
+    parser.add_argument("--states", nargs="+", default=["CA", "NY", "TX", "FL", "WA"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    postings = varied_postings(args.count)
+    job_filter = JobFilter(required_keywords=args.keywords, states_to_exclude=args.states)
+
+    legacy_time, legacy_kept = bench(lambda: legacy_filter(postings, args.keywords, args.states), args.repeat)
+    compiled_time, compiled_kept = bench(lambda: job_filter.apply(postings), args.repeat)
+    if compiled_kept != legacy_kept:
+        raise SystemExit(f"Filters disagree: legacy kept {len(legacy_kept)}, JobFilter kept {len(compiled_kept)}")
+
+    print(f"{len(postings)} postings, {len(legacy_kept)} kept by both filters")
+    for name, seconds in (("legacy", legacy_time), ("JobFilter", compiled_time)):
+        print(f"{name:>9}: {seconds * 1000:8.1f} ms, {seconds / len(postings) * 1e6:6.2f} us/posting, "
+              f"{legacy_time / seconds:4.1f}x vs legacy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# benchmarks/bench_pipeline.py
+#
+# Runs the full main.py graph against local stand-ins for every paid API and
+# reports wall time, peak RSS and calls per provider for each posting count.
+# Each size runs in a fresh subprocess with its own working directory, so
+# caches start cold and peak RSS belongs to that run alone.
+#
+#   python -m benchmarks.bench_pipeline                                # N = 10, 100, 1000
+#   python -m benchmarks.bench_pipeline --sizes 10 100 --latency-scale 0
+#   python -m benchmarks.bench_pipeline --error-rate 0.02 --throttle-rate 0.05
+#   python -m benchmarks.bench_pipeline --recordings recorded/ --output results.json
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import REPO_ROOT
+from benchmarks.stub_providers import (DEFAULT_LATENCY, AnthropicStub, ApolloStub, Faults, ProxycurlStub,
+                                       ScraperApiStub, StubServer)
+
+
+def bench_configs(size, servers, args):
+    limits = {
+        'requests_per_second': args.provider_rps,
+        'burst': args.provider_rps,
+        'max_concurrency': args.provider_concurrency,
+    }
+    caches_enabled = not args.no_caches
+    return {
+        'indeed': {
+            'search_query': "data engineer",
+            'scraper_api_key': "bench",
+            'scraper_api_url': servers['scraperapi'].url,
+            'required_keywords': [],
+            'states_to_exclude': [],
+            'minimum_entries': size,
+            'max_pages': size // 10 + 2,
+            'concurrency': args.scrape_concurrency,
+        },
+        'apollo_io': {'api_key': "bench", 'base_url': f"{servers['apollo'].url}/v1", **limits},
+        'proxycurl': {'api_key': "bench", 'base_url': f"{servers['proxycurl'].url}/proxycurl/api", **limits},
+        'anthropic': {
+            'api_key': "bench",
+            'base_url': servers['anthropic'].url,
+            'temperature': None,
+            'max_concurrency': args.provider_concurrency,
+            'max_backoff': 10.0,
+        },
+        'contact_finding': {'workers': args.provider_concurrency},
+        'email_sequences': {'initial_outreach': {}},
+        'enrichment_cache': {'enabled': caches_enabled},
+        'response_cache': {'enabled': caches_enabled},
+        'seen_postings': {'enabled': caches_enabled},
+    }
+
+
+def run_child(config_path):
+    import logging
+    import resource
+
+    # Before main.py configures INFO logging for the whole process.
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(config_path, "r") as f:
+        configs = json.load(f)
+
+    started = time.perf_counter()
+    from main import build_workflow
+    import_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = asyncio.run(build_workflow(configs).ainvoke({"job_postings": [], "contacts": [], "prepared_emails": []}))
+    print(json.dumps({
+        'import_seconds': import_seconds,
+        'wall_seconds': time.perf_counter() - started,
+        # Linux reports kilobytes.
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'job_postings': len(result['job_postings']),
+        'contacts': len(result['contacts']),
+        'prepared_emails': len(result['prepared_emails']),
+    }))
+
+
+def run_size(size, servers, args):
+    for server in servers.values():
+        server.provider.reset()
+    servers['scraperapi'].provider.set_postings(size)
+
+    with tempfile.TemporaryDirectory(prefix=f"bench-{size}-") as workdir:
+        config_path = os.path.join(workdir, "configs.json")
+        with open(config_path, "w") as f:
+            json.dump(bench_configs(size, servers, args), f)
+
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, (REPO_ROOT, os.environ.get('PYTHONPATH'))))}
+        completed = subprocess.run([sys.executable, "-m", "benchmarks.bench_pipeline", "--child", config_path],
+                                   cwd=workdir, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            sys.stderr.write(completed.stderr)
+            raise RuntimeError(f"Benchmark run for N={size} failed with exit code {completed.returncode}")
+        if args.verbose:
+            sys.stderr.write(completed.stderr)
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['size'] = size
+    result['calls'] = {name: server.provider.call_summary() for name, server in servers.items()}
+    return result
+
+
+def format_calls(calls):
+    parts = []
+    for provider, operations in calls.items():
+        for operation, counts in sorted(operations.items()):
+            failed = f" ({counts['failed']} failed)" if counts['failed'] else ""
+            parts.append(f"{provider}.{operation}={counts['calls']}{failed}")
+    return ", ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="postings per run")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiplier on each stand-in's typical latency; 0 disables it")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of calls answered with a 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds sent with injected 429s")
+    parser.add_argument("--recordings", help="directory of recorded responses, <provider>/<operation>.json|html")
+    parser.add_argument("--scrape-concurrency", type=int, default=5, help="Indeed pages in flight")
+    parser.add_argument("--provider-concurrency", type=int, default=10, help="in-flight requests per API")
+    parser.add_argument("--provider-rps", type=float, default=50.0, help="client-side rate limit per API")
+    parser.add_argument("--no-caches", action="store_true", help="disable the enrichment, response and seen caches")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--verbose", action="store_true", help="echo each run's warnings and errors")
+    parser.add_argument("--child", metavar="CONFIG", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    def faults(provider):
+        return Faults(latency=DEFAULT_LATENCY[provider] * args.latency_scale, error_rate=args.error_rate,
+                      throttle_rate=args.throttle_rate, retry_after=args.retry_after)
+
+    providers = [
+        ScraperApiStub(faults('scraperapi'), args.recordings),
+        ApolloStub(faults('apollo'), args.recordings),
+        ProxycurlStub(faults('proxycurl'), args.recordings),
+        AnthropicStub(faults('anthropic'), args.recordings),
+    ]
+    servers = {provider.name: StubServer(provider).start() for provider in providers}
+
+    results = []
+    try:
+        for size in args.sizes:
+            result = run_size(size, servers, args)
+            results.append(result)
+            print(f"N={size:>5}: {result['wall_seconds']:7.2f}s wall, {result['peak_rss_mb']:6.1f} MiB peak RSS, "
+                  f"{result['prepared_emails']}/{result['job_postings']} emails/postings")
+            print(f"         {format_calls(result['calls'])}")
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
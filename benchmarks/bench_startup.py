@@ -0,0 +1,109 @@
+# benchmarks/bench_startup.py
+#
+# Measures how long each main.py subcommand spends starting up. Every command
+# runs as `python -X importtime main.py <command>` in one scratch directory
+# against the local API stand-ins, in pipeline order (scrape, enrich,
+# generate, report, run), so each stage reads the previous stage's output.
+# Reported per command: total import time, the slowest top-level imports and
+# the process's wall time.
+#
+#   python -m benchmarks.bench_startup
+#   python -m benchmarks.bench_startup --size 50 --repeat 5 --output startup.json
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+from benchmarks.bench_pipeline import bench_configs
+from benchmarks.fixtures import REPO_ROOT
+from benchmarks.stub_providers import AnthropicStub, ApolloStub, ProxycurlStub, ScraperApiStub, StubServer
+
+COMMANDS = [
+    ["--help"],
+    ["scrape"],
+    ["enrich"],
+    ["generate"],
+    ["report"],
+    ["run"],
+]
+
+
+def top_level_imports(stderr):
+    # -X importtime lines: "import time: <self us> | <cumulative us> | <indented module name>".
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("| imported package"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):
+            imports[name.strip()] = int(cumulative) / 1e6
+    return imports
+
+
+def run_command(command, workdir, env):
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", os.path.join(REPO_ROOT, "main.py"), *command],
+                               cwd=workdir, env=env, capture_output=True, text=True)
+    wall_seconds = time.perf_counter() - started
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr[-4000:])
+        raise RuntimeError(f"`main.py {' '.join(command)}` failed with exit code {completed.returncode}")
+    imports = top_level_imports(completed.stderr)
+    return {
+        'wall_seconds': wall_seconds,
+        'import_seconds': sum(imports.values()),
+        'slowest_imports': dict(sorted(imports.items(), key=lambda item: -item[1])[:3]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=10, help="postings scraped per run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of the whole command sequence; medians are reported")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    providers = [ScraperApiStub(), ApolloStub(), ProxycurlStub(), AnthropicStub()]
+    servers = {provider.name: StubServer(provider).start() for provider in providers}
+    limits = argparse.Namespace(provider_rps=100.0, provider_concurrency=10, no_caches=True, scrape_concurrency=5)
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, (REPO_ROOT, os.environ.get('PYTHONPATH'))))}
+
+    samples = {" ".join(command): [] for command in COMMANDS}
+    try:
+        servers['scraperapi'].provider.set_postings(args.size)
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory(prefix="bench-startup-") as workdir:
+                configs = {**bench_configs(args.size, servers, limits), 'hunter_io': {'api_key': "bench"}}
+                with open(os.path.join(workdir, "configs.yaml"), "w") as f:
+                    yaml.safe_dump(configs, f)
+                for command in COMMANDS:
+                    samples[" ".join(command)].append(run_command(command, workdir, env))
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    results = {}
+    for command, runs in samples.items():
+        results[command] = {
+            'import_seconds': statistics.median(run['import_seconds'] for run in runs),
+            'wall_seconds': statistics.median(run['wall_seconds'] for run in runs),
+            'slowest_imports': runs[-1]['slowest_imports'],
+        }
+        slowest = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in results[command]['slowest_imports'].items())
+        print(f"{command:<10} {results[command]['import_seconds'] * 1000:7.0f}ms imports "
+              f"{results[command]['wall_seconds']:6.2f}s wall   ({slowest})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
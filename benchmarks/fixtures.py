@@ -0,0 +1,123 @@
+# benchmarks/fixtures.py
+
+import html
+import json
+import os
+import random
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Enough of an Indeed results card to exercise every selector the scraper
+# uses, plus the kind of nesting and filler that make real pages expensive.
+CARD_TEMPLATE = """
+<li class="css-5lfssm eu4oa1w0">
+  <div class="cardOutline tapItem dd-privacy-allow result job_{index}">
+    <div class="slider_container css-8xisqv eu4oa1w0">
+      <div class="slider_list css-bxr6tz eu4oa1w0">
+        <div class="slider_item css-kyg8or eu4oa1w0">
+          <div class="job_seen_beacon">
+            <table class="mainContentTable" role="presentation"><tbody><tr><td class="resultContent css-1qwrrf0 eu4oa1w0">
+              <div class="css-dekpa e37uo190">
+                <h2 class="jobTitle css-198pbd eu4oa1w0" tabindex="-1">
+                  <a class="jcs-JobTitle css-jspxzf eu4oa1w0" data-jk="{index:016x}" href="/rc/clk?jk={index:016x}">
+                    <span title="{title}" id="jobTitle-{index:016x}">{title}</span>
+                  </a>
+                </h2>
+              </div>
+              <div class="company_location css-17fky0v e37uo190">
+                <div class="css-1afmp4o e37uo190">
+                  <span data-testid="company-name" class="css-1h7lukg eu4oa1w0">{company}</span>
+                  <div data-testid="text-location" class="css-1restlb eu4oa1w0">{location}</div>
+                </div>
+              </div>
+              <div class="jobMetaDataGroup css-qspwa8 eu4oa1w0">
+                <div class="css-1cvo3fd eu4oa1w0"><div class="metadata css-5zy3wz eu4oa1w0">
+                  <div data-testid="attribute_snippet_testid" class="css-1cvvo1b eu4oa1w0">Full-time</div>
+                </div></div>
+              </div>
+            </td></tr></tbody></table>
+            <table class="jobCardShelfContainer big6_visualChanges" role="presentation"><tbody><tr><td>
+              <div class="heading6 tapItem-gutter result-footer">
+                <div class="css-9446fg eu4oa1w0"><ul style="list-style-type:circle;margin-top: 0px;margin-bottom: 0px;padding-left:20px;">
+                  <li>{description}</li>
+                  <li>Competitive salary and benefits package.</li>
+                </ul></div>
+                <span data-testid="myJobsStateDate" class="css-10pe3me eu4oa1w0"><span class="css-1rqpxry e1wnkr790">Posted</span>{post_date}</span>
+              </div>
+            </td></tr></tbody></table>
+          </div>
+        </div>
+      </div>
+    </div>
+  </div>
+</li>
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Data Engineer Jobs | Indeed</title>
+<script>{script}</script></head>
+<body><div id="mosaic-provider-jobcards" class="mosaic mosaic-provider-jobcards">
+<ul class="css-zu9cdh eu4oa1w0">{cards}</ul></div>
+<nav role="navigation" aria-label="pagination"><ul class="css-1g90gv6 eu4oa1w0">
+{next_link}
+</ul></nav></body></html>
+"""
+
+# Indeed serves minified markup; keep the template readable and strip it here.
+CARD_TEMPLATE = re.sub(r">\s+<", "><", CARD_TEMPLATE.strip())
+
+POST_DATES = ["Just posted", "Today", "1 day ago", "3 days ago", "7 days ago", "30+ days ago"]
+
+
+def load_postings(name="job_posts.json"):
+    with open(os.path.join(REPO_ROOT, name), "r") as f:
+        return json.load(f)
+
+
+def synthetic_postings(count, seed=0):
+    # Cycles through the recorded postings, varying company and location so
+    # downstream dedup doesn't collapse everything onto a handful of keys.
+    rng = random.Random(seed)
+    recorded = load_postings()
+    postings = []
+    for index in range(count):
+        base = recorded[index % len(recorded)]
+        round_number = index // len(recorded)
+        postings.append({
+            "company_name": base["company_name"] if round_number == 0 else f"{base['company_name']} {round_number}",
+            "job_title": base["job_title"],
+            "job_location": base["job_location"],
+            "job_description": base["job_description"],
+            "job_post_date": f"Posted{rng.choice(POST_DATES)}",
+            "source": "Indeed",
+        })
+    return postings
+
+
+def render_indeed_page(postings, start=0, has_next=True):
+    cards = "".join(
+        CARD_TEMPLATE.format(
+            index=start + offset,
+            title=html.escape(job["job_title"]),
+            company=html.escape(job["company_name"]),
+            location=html.escape(job["job_location"]),
+            description=html.escape(job["job_description"]),
+            post_date=html.escape(job["job_post_date"].replace("Posted", "", 1)),
+        )
+        for offset, job in enumerate(postings)
+    )
+    next_link = (f'<li><a data-testid="pagination-page-next" aria-label="Next Page" '
+                 f'href="/jobs?q=data+engineer&amp;start={start + len(postings)}">Next</a></li>') if has_next else ""
+    # Real result pages carry a few hundred KB of inline state; pad accordingly.
+    script = "window.mosaic = " + json.dumps({"providerData": ["x" * 64] * 2000}) + ";"
+    return PAGE_TEMPLATE.format(cards=cards, next_link=next_link, script=script)
+
+
+def indeed_pages(total_postings, per_page=10, seed=0):
+    postings = synthetic_postings(total_postings, seed=seed)
+    pages = []
+    for start in range(0, len(postings), per_page):
+        chunk = postings[start:start + per_page]
+        pages.append(render_indeed_page(chunk, start=start, has_next=start + per_page < len(postings)))
+    return pages
@@ -0,0 +1,380 @@
+# benchmarks/stub_providers.py
+#
+# Local stand-ins for ScraperAPI, Apollo, Proxycurl and Anthropic. Each one
+# runs its own HTTP server on 127.0.0.1, counts calls per operation, and can
+# inject latency, server errors and 429s. Responses are synthesized from the
+# fixtures, unless a recording exists at <recordings>/<provider>/<operation>.json
+# (.html for ScraperAPI pages), in which case it is replayed verbatim.
+
+import abc
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import render_indeed_page, synthetic_postings
+
+RESULTS_PER_PAGE = 10
+
+# Rough medians observed against the real services, in seconds.
+DEFAULT_LATENCY = {
+    'scraperapi': 0.5,
+    'apollo': 0.1,
+    'proxycurl': 0.2,
+    'anthropic': 1.0,
+}
+
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Jamie", "Riley"]
+LAST_NAMES = ["Nguyen", "Garcia", "Smith", "Patel", "Kim", "Johnson", "Lopez", "Brown"]
+
+
+class Faults:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.25, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 1.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def inject(self):
+        # Sleeps for the simulated latency; returns the status code to fail
+        # with, or None to answer normally.
+        with self._lock:
+            delay = self.latency * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+            roll = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+
+class EventStream(list):
+    """A server-sent event response: a list of (event, data) pairs."""
+
+
+def message_events(message: dict) -> EventStream:
+    # The event sequence the Messages API streams for a single text block.
+    usage = message.get('usage', {})
+    events = EventStream()
+    events.append(('message_start', {'type': 'message_start', 'message': {
+        **message, 'content': [], 'stop_reason': None, 'usage': {**usage, 'output_tokens': 0}}}))
+    for index, block in enumerate(message.get('content', [])):
+        events.append(('content_block_start', {'type': 'content_block_start', 'index': index,
+                                               'content_block': {'type': 'text', 'text': ""}}))
+        events.append(('content_block_delta', {'type': 'content_block_delta', 'index': index,
+                                               'delta': {'type': 'text_delta', 'text': block.get('text', "")}}))
+        events.append(('content_block_stop', {'type': 'content_block_stop', 'index': index}))
+    events.append(('message_delta', {'type': 'message_delta',
+                                     'delta': {'stop_reason': message.get('stop_reason'), 'stop_sequence': None},
+                                     'usage': {'output_tokens': usage.get('output_tokens', 0)}}))
+    events.append(('message_stop', {'type': 'message_stop'}))
+    return events
+
+
+def _stable_id(*parts) -> str:
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:24]
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", text.lower()) or "company"
+
+
+class StubProvider(abc.ABC):
+    name = None
+
+    def __init__(self, faults: Faults = None, recordings: str = None):
+        self.faults = faults or Faults()
+        self.recordings = recordings
+        self.calls = Counter()
+        self._recorded = {}
+        self._lock = threading.Lock()
+
+    def count(self, operation: str, status: int):
+        with self._lock:
+            self.calls[(operation, status)] += 1
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+
+    def call_summary(self):
+        summary = {}
+        for (operation, status), count in self.calls.items():
+            entry = summary.setdefault(operation, {'calls': 0, 'failed': 0})
+            entry['calls'] += count
+            if status >= 400:
+                entry['failed'] += count
+        return summary
+
+    def recorded(self, operation: str, extension: str = "json"):
+        if not self.recordings:
+            return None
+        if operation not in self._recorded:
+            path = os.path.join(self.recordings, self.name, f"{operation}.{extension}")
+            body = None
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    body = f.read() if extension == "html" else json.load(f)
+            self._recorded[operation] = body
+        return self._recorded[operation]
+
+    @abc.abstractmethod
+    def route(self, method: str, path: str, query: dict, body: dict):
+        """Returns (operation, payload); payload is a dict for JSON, a str for HTML or an EventStream.
+
+        (None, None) means the provider has no such endpoint.
+        """
+
+
+class ScraperApiStub(StubProvider):
+    name = 'scraperapi'
+
+    def __init__(self, faults: Faults = None, recordings: str = None, total_postings: int = 0):
+        super().__init__(faults, recordings)
+        self.set_postings(total_postings)
+
+    def set_postings(self, total_postings: int):
+        self.postings = synthetic_postings(total_postings)
+
+    def route(self, method, path, query, body):
+        recorded = self.recorded('indeed_page', 'html')
+        if recorded is not None:
+            return 'indeed_page', recorded
+        target = urlparse(query.get('url', [''])[0])
+        start = int(parse_qs(target.query).get('start', ['0'])[0])
+        chunk = self.postings[start:start + RESULTS_PER_PAGE]
+        return 'indeed_page', render_indeed_page(chunk, start=start,
+                                                 has_next=start + RESULTS_PER_PAGE < len(self.postings))
+
+
+class ApolloStub(StubProvider):
+    name = 'apollo'
+
+    def __init__(self, faults: Faults = None, recordings: str = None):
+        super().__init__(faults, recordings)
+        self.people = {}
+        # Person ids bulk_match leaves out of its response entirely, the way
+        # Apollo drops people it can't match instead of returning null.
+        self.omitted = set()
+
+    def _person(self, company_name: str) -> dict:
+        person_id = _stable_id('apollo', company_name)
+        seed = int(person_id[:8], 16)
+        first_name = FIRST_NAMES[seed % len(FIRST_NAMES)]
+        last_name = LAST_NAMES[seed // len(FIRST_NAMES) % len(LAST_NAMES)]
+        person = {
+            'id': person_id,
+            'first_name': first_name,
+            'last_name': last_name,
+            'title': "Talent Acquisition Partner",
+            'email': f"{first_name.lower()}.{last_name.lower()}@{_slug(company_name)}.example.com",
+            'linkedin_url': f"https://www.linkedin.com/in/{first_name.lower()}-{last_name.lower()}-{person_id[:8]}",
+            'organization': {'name': company_name},
+        }
+        with self._lock:
+            self.people[person_id] = person
+        return person
+
+    def route(self, method, path, query, body):
+        if path.endswith('/mixed_people/search'):
+            recorded = self.recorded('search')
+            if recorded is not None:
+                return 'search', recorded
+            person = self._person(body.get('q_organization_name', ''))
+            # Search results carry no email; that takes an enrich call.
+            return 'search', {'people': [{key: value for key, value in person.items() if key != 'email'}]}
+        if path.endswith('/people/enrich'):
+            recorded = self.recorded('enrich')
+            if recorded is not None:
+                return 'enrich', recorded
+            person = self.people.get(body.get('id'))
+            return 'enrich', {'person': person} if person else {}
+        if path.endswith('/people/bulk_match'):
+            recorded = self.recorded('bulk_match')
+            if recorded is not None:
+                return 'bulk_match', recorded
+            return 'bulk_match', {'matches': [self.people.get(detail.get('id')) for detail in body.get('details', [])
+                                              if detail.get('id') not in self.omitted]}
+        return None, None
+
+
+class ProxycurlStub(StubProvider):
+    name = 'proxycurl'
+
+    def route(self, method, path, query, body):
+        if not path.endswith('/v2/linkedin'):
+            return None, None
+        recorded = self.recorded('linkedin')
+        if recorded is not None:
+            return 'linkedin', recorded
+        seed = int(_stable_id('proxycurl', query.get('url', [''])[0])[:8], 16)
+        city, state = [("Austin", "Texas"), ("Denver", "Colorado"), ("Chicago", "Illinois"),
+                       ("Seattle", "Washington")][seed % 4]
+        return 'linkedin', {
+            'country': "US",
+            'city': city,
+            'state': state,
+            'industry': "Information Technology & Services",
+            'company_domain': None,
+        }
+
+
+class AnthropicStub(StubProvider):
+    name = 'anthropic'
+
+    def __init__(self, faults: Faults = None, recordings: str = None):
+        super().__init__(faults, recordings)
+        self.cached_prefixes = set()
+
+    @staticmethod
+    def _prompt_fields(body: dict) -> dict:
+        content = body['messages'][-1]['content']
+        if isinstance(content, list):
+            content = "\n".join(block.get('text', '') for block in content)
+        return dict(line.split(": ", 1) for line in content.splitlines() if ": " in line)
+
+    def route(self, method, path, query, body):
+        if not path.endswith('/v1/messages'):
+            return None, None
+        recorded = self.recorded('messages')
+        if recorded is not None:
+            return 'messages', message_events(recorded) if body.get('stream') else recorded
+
+        fields = self._prompt_fields(body)
+        text = (
+            f"Subject: {fields.get('Job Title', 'Your open role')} - a strong candidate\n\n"
+            f"Hi {fields.get('Contact Name', 'there').split(' ')[0]},\n\n"
+            f"I'm working with an exceptional candidate for the {fields.get('Job Title')} role at "
+            f"{fields.get('Company')}. If they aren't the right fit, I'd be glad to hear about other openings.\n\n"
+            "- 7 years building production data platforms\n"
+            "- Led migrations to cloud warehouses and streaming pipelines\n\n"
+            "Would you like to review their resume?\n\nBest regards"
+        )
+
+        # Mimic prompt caching: the first request with a given cached system
+        # prefix writes it, later ones read it.
+        system = body.get('system') or []
+        system_text = "".join(block.get('text', '') for block in system) if isinstance(system, list) else system
+        system_tokens = len(system_text) // 4
+        cached = isinstance(system, list) and any('cache_control' in block for block in system)
+        cache_write = cache_read = 0
+        if cached:
+            with self._lock:
+                if system_text in self.cached_prefixes:
+                    cache_read = system_tokens
+                else:
+                    self.cached_prefixes.add(system_text)
+                    cache_write = system_tokens
+        user_tokens = sum(len(str(message['content'])) for message in body['messages']) // 4
+
+        message = {
+            'id': f"msg_{_stable_id('anthropic', text)}",
+            'type': 'message',
+            'role': 'assistant',
+            'model': body.get('model'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {
+                'input_tokens': user_tokens + (0 if cached else system_tokens),
+                'cache_creation_input_tokens': cache_write,
+                'cache_read_input_tokens': cache_read,
+                'output_tokens': len(text) // 4,
+            },
+        }
+        return 'messages', message_events(message) if body.get('stream') else message
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload, headers: dict = None):
+        if isinstance(payload, EventStream):
+            data = "".join(f"event: {event}\ndata: {json.dumps(item)}\n\n" for event, item in payload).encode("utf-8")
+            content_type = "text/event-stream"
+        elif isinstance(payload, str):
+            data, content_type = payload.encode("utf-8"), "text/html; charset=utf-8"
+        else:
+            data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on this request (e.g. a cancelled page prefetch).
+            self.close_connection = True
+
+    def _handle(self):
+        provider = self.server.provider
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+
+        operation, payload = provider.route(self.command, url.path, parse_qs(url.query), body)
+        if operation is None:
+            self._send(404, {'error': f"no stub for {self.command} {url.path}"})
+            return
+
+        status = provider.faults.inject()
+        provider.count(operation, status or 200)
+        if status == 429:
+            self._send(429, {'type': 'error', 'error': {'type': 'rate_limit_error', 'message': "Injected 429"}},
+                       {"retry-after": str(provider.faults.retry_after)})
+        elif status:
+            self._send(status, {'type': 'error', 'error': {'type': 'api_error', 'message': "Injected failure"}})
+        else:
+            self._send(200, payload)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class StubServer:
+    def __init__(self, provider: StubProvider):
+        self.provider = provider
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.provider = provider
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name=f"stub-{provider.name}", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -1,52 +1,149 @@
 # main.py
+#
+#   python main.py run [--stream | --checkpoint | --resume RUN_ID]   # the whole pipeline
+#   python main.py scrape [--run-id RUN_ID]                          # postings only
+#   python main.py enrich [--run-id RUN_ID]                          # contacts for a scraped run
+#   python main.py generate [--run-id RUN_ID]                        # emails for an enriched run
+#   python main.py report [--run-id RUN_ID] [--metrics PATH]
+#
+# The stage commands hand records to each other through the run's JSONL
+# output files; enrich and generate default to the most recently scraped run.
+# Plain `python main.py [--stream ...]` still runs the whole pipeline.
+#
+# langgraph, anthropic, bs4, yaml, dotenv and the agents are imported only by
+# the commands that use them, so `report` or `--help` starts in milliseconds.
 
-import yaml
-import os
-from langgraph.graph import StateGraph
-from src.agents.job_scraping_agent import job_scraping_agent
-from src.agents.contact_finding_agent import contact_finding_agent
-from src.agents.email_outreach_agent import email_outreach_agent
-from dotenv import load_dotenv
-import logging
+import argparse
 import asyncio
+import glob
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import List
 
-load_dotenv()
+from src.utils.checkpoints import CheckpointStore, checkpointed_node, new_run_id
+from src.utils.jsonl_sink import RunOutput, iter_jsonl, latest_output, output_dir, output_path, output_run_id
+from src.utils.metrics import METRICS, instrumented_node
+from src.utils.records import STATE_RECORDS, Contact, JobPosting, PreparedEmail, decode_state
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-async def main():
-    try:
-        with open("configs.yaml", "r") as config_file:
-            configs = yaml.safe_load(config_file)
+COMMANDS = ('scrape', 'enrich', 'generate', 'run', 'report')
+NODES = ('scrape_jobs', 'find_contacts', 'prepare_emails')
+
+def read_configs(path):
+    import yaml
+    with open(path, "r") as config_file:
+        return yaml.safe_load(config_file)
+
+def load_configs(path):
+    from dotenv import load_dotenv
+    load_dotenv()
+    configs = read_configs(path)
+
+    os.environ['HUNTER_API_KEY'] = configs['hunter_io']['api_key']
+    os.environ['ANTHROPIC_API_KEY'] = configs['anthropic']['api_key']
+    os.environ['APOLLO_API_KEY'] = configs['apollo_io']['api_key']
+    return configs
+
+def log_prepared_email(i, email):
+    logger.info(f"\nEmail {i}:")
+    logger.info(f"To: {email['to_email']}")
+    logger.info(f"Subject: {email['subject']}")
+    logger.info(f"Content:\n{email['content']}")
+    logger.info("-" * 50)
+
+async def run_streaming(configs, output=None):
+    from src.agents.streaming_pipeline import run_streaming_pipeline
+
+    logger.info("Starting streaming workflow...")
+    email_count = 0
 
-        os.environ['HUNTER_API_KEY'] = configs['hunter_io']['api_key']
-        os.environ['ANTHROPIC_API_KEY'] = configs['anthropic']['api_key']
-        os.environ['APOLLO_API_KEY'] = configs['apollo_io']['api_key']
+    def on_email(email):
+        nonlocal email_count
+        email_count += 1
+        log_prepared_email(email_count, email)
 
-        class State(dict):
-            job_postings: list
-            contacts: list
-            prepared_emails: list
+    with METRICS.timer("node", node="streaming_pipeline"):
+        result = await run_streaming_pipeline(configs, on_email, output)
 
-        graph = StateGraph(State)
+    logger.info(f"Scraped {result['job_postings']} job postings")
+    logger.info(f"Looked up contacts for {result['companies']} companies")
+    logger.info(f"Prepared {result['prepared_emails']} personalized emails")
 
-        graph.add_node("scrape_jobs", job_scraping_agent(configs))
-        graph.add_node("find_contacts", contact_finding_agent(configs))
-        graph.add_node("prepare_emails", email_outreach_agent(configs))
+class State(dict):
+    # Each node returns only the keys it produces.
+    job_postings: List[JobPosting]
+    contacts: List[Contact]
+    prepared_emails: List[PreparedEmail]
 
-        graph.add_edge("scrape_jobs", "find_contacts")
-        graph.add_edge("find_contacts", "prepare_emails")
+def build_workflow(configs, store=None, run_id=None, output=None):
+    from langgraph.graph import StateGraph
+    from src.agents.job_scraping_agent import job_scraping_agent
+    from src.agents.contact_finding_agent import contact_finding_agent
+    from src.agents.email_outreach_agent import email_outreach_agent
 
-        graph.set_entry_point("scrape_jobs")
-        graph.set_finish_point("prepare_emails")
+    # With a checkpoint store every node's output is saved under run_id, and
+    # the contact and email nodes also save each finished item as they go.
+    # With output, every node appends its records to the run's JSONL files.
+    def node(name, factory, itemized=False):
+        kwargs = {}
+        if output is not None:
+            kwargs['output'] = output
+        checkpoint = store.scope(run_id, name) if store is not None and itemized else None
+        if checkpoint is not None:
+            kwargs['checkpoint'] = checkpoint
+        run = instrumented_node(name, factory(configs, **kwargs))
+        if store is None:
+            return run
+        return checkpointed_node(store, run_id, name, run, decode=decode_state, checkpoint=checkpoint,
+                                 requires=NODES[:NODES.index(name)])
 
-        workflow = graph.compile()
+    graph = StateGraph(State)
+
+    graph.add_node("scrape_jobs", node("scrape_jobs", job_scraping_agent))
+    graph.add_node("find_contacts", node("find_contacts", contact_finding_agent, itemized=True))
+    graph.add_node("prepare_emails", node("prepare_emails", email_outreach_agent, itemized=True))
+
+    graph.add_edge("scrape_jobs", "find_contacts")
+    graph.add_edge("find_contacts", "prepare_emails")
+
+    graph.set_entry_point("scrape_jobs")
+    graph.set_finish_point("prepare_emails")
+
+    return graph.compile()
+
+async def run(configs, args):
+    store = None
+    run_id = None
+    output = None
+    try:
+        if args.stream:
+            output = RunOutput.from_configs(configs, new_run_id())
+            await run_streaming(configs, output)
+            if output is not None:
+                output.close()
+            logger.info("Workflow completed successfully.")
+            return
+
+        if args.checkpoint or args.resume:
+            store = CheckpointStore.from_configs(configs)
+            if args.resume and store.run_status(args.resume) is None:
+                raise ValueError(f"No checkpointed run with id {args.resume}")
+            run_id = store.start_run(args.resume)
+            logger.info(f"{'Resuming' if args.resume else 'Checkpointing'} run {run_id}")
+
+        # A resumed run keeps appending to the same (still partial) output files.
+        output = RunOutput.from_configs(configs, run_id or new_run_id())
+        workflow = build_workflow(configs, store, run_id, output)
 
         logger.info("Starting workflow...")
         initial_state = {"job_postings": [], "contacts": [], "prepared_emails": []}
         result = await workflow.ainvoke(initial_state)
-        
+
         logger.info("Workflow completed.")
         logger.info(f"Scraped {len(result['job_postings'])} job postings")
         logger.info(f"Found contact information for {len(result['contacts'])} companies")
@@ -54,16 +151,171 @@ async def main():
 
         logger.info("\n" + "="*50 + "\nPrepared Emails:\n" + "="*50)
         for i, email in enumerate(result['prepared_emails'], 1):
-            logger.info(f"\nEmail {i}:")
-            logger.info(f"To: {email['to_email']}")
-            logger.info(f"Subject: {email['subject']}")
-            logger.info(f"Content:\n{email['content']}")
-            logger.info("-" * 50)
+            log_prepared_email(i, email)
+
+        unfinished = [name for name in NODES if name not in store.completed_nodes(run_id)] if store is not None else []
+        if unfinished:
+            # Some items failed; their nodes weren't saved, so a resume retries
+            # just those items. The output stays partial so the resume appends to it.
+            store.finish_run(run_id, 'incomplete')
+            if output is not None:
+                output.close(complete=False)
+            logger.warning(f"{', '.join(unfinished)} had failed items. "
+                           f"Retry them with: python main.py run --resume {run_id}")
+            return
 
+        if store is not None:
+            store.finish_run(run_id)
+        if output is not None:
+            output.close()
         logger.info("Workflow completed successfully.")
 
+    except Exception:
+        if output is not None:
+            # Left as .partial: readable, but never mistaken for a complete run.
+            output.close(complete=False)
+        if store is not None and run_id is not None:
+            store.finish_run(run_id, 'failed')
+            logger.info(f"Continue this run with: python main.py run --resume {run_id}")
+        raise
+
+def stage_run_id(configs, args):
+    # enrich, generate and report work on the most recently scraped run by default.
+    if args.run_id:
+        return args.run_id
+    path = latest_output(output_dir(configs), 'job_postings')
+    if path is None:
+        raise FileNotFoundError(f"No scraped postings in {output_dir(configs)}; run `python main.py scrape` first")
+    return output_run_id(path, 'job_postings')
+
+def read_stage_input(configs, run_id, name):
+    path = output_path(output_dir(configs), name, run_id)
+    if path is None:
+        raise FileNotFoundError(f"No completed {name} output for run {run_id} in {output_dir(configs)}")
+    records = list(iter_jsonl(path, name))
+    logger.info(f"Read {len(records)} {name} from {path}")
+    return records
+
+async def run_stage(configs, run_id, name, agent, state):
+    output = RunOutput.from_configs(configs, run_id)
+    if output is None:
+        raise ValueError("The scrape, enrich and generate commands pass records on through output files; "
+                         "set output.enabled in configs.yaml")
+    try:
+        result = await instrumented_node(name, agent(configs, output=output))(state)
+    except BaseException:
+        output.close(complete=False)
+        raise
+    output.close()
+    return result
+
+async def scrape(configs, args):
+    from src.agents.job_scraping_agent import job_scraping_agent
+
+    run_id = args.run_id or new_run_id()
+    result = await run_stage(configs, run_id, "scrape_jobs", job_scraping_agent, {})
+    logger.info(f"Scraped {len(result['job_postings'])} job postings for run {run_id}")
+
+async def enrich(configs, args):
+    from src.agents.contact_finding_agent import contact_finding_agent
+
+    run_id = stage_run_id(configs, args)
+    state = {'job_postings': read_stage_input(configs, run_id, 'job_postings')}
+    result = await run_stage(configs, run_id, "find_contacts", contact_finding_agent, state)
+    logger.info(f"Found contact information for {len(result['contacts'])} companies for run {run_id}")
+
+async def generate(configs, args):
+    from src.agents.email_outreach_agent import email_outreach_agent
+
+    run_id = stage_run_id(configs, args)
+    state = {
+        'job_postings': read_stage_input(configs, run_id, 'job_postings'),
+        'contacts': read_stage_input(configs, run_id, 'contacts'),
+    }
+    result = await run_stage(configs, run_id, "prepare_emails", email_outreach_agent, state)
+    logger.info(f"Prepared {len(result['prepared_emails'])} personalized emails for run {run_id}")
+
+async def report(configs, args):
+    try:
+        run_id = stage_run_id(configs, args)
+    except FileNotFoundError as e:
+        logger.info(str(e))
+        run_id = None
+    if run_id is not None:
+        logger.info(f"Run {run_id}:")
+        for name in STATE_RECORDS:
+            path = output_path(output_dir(configs), name, run_id)
+            if path is None:
+                logger.info(f"  {name}: no completed output")
+            else:
+                logger.info(f"  {name}: {sum(1 for _ in iter_jsonl(path))} records in {path}")
+
+    report_dir = configs.get('metrics', {}).get('report_dir', 'reports')
+    reports = glob.glob(os.path.join(report_dir, "metrics-*.json"))
+    metrics_path = args.metrics or (max(reports, key=os.path.getmtime) if reports else None)
+    if metrics_path is None:
+        logger.info(f"No metrics reports in {report_dir}")
+        return
+    with open(metrics_path, "r") as f:
+        METRICS.merge(json.load(f))
+    logger.info(f"Metrics from {metrics_path}:")
+    METRICS.log_summary()
+
+def write_metrics_report(configs):
+    report_dir = configs.get('metrics', {}).get('report_dir', 'reports')
+    path = METRICS.write_report(os.path.join(report_dir, f"metrics-{datetime.now():%Y%m%d-%H%M%S}"))
+    METRICS.log_summary()
+    logger.info(f"Performance report written to {path}")
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default="configs.yaml", help="path to the YAML configs (default: configs.yaml)")
+
+    parser = argparse.ArgumentParser(description="Scrape job postings, find hiring contacts and draft outreach emails.")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    run_parser = commands.add_parser("run", parents=[common], help="run the whole pipeline (the default)")
+    run_parser.add_argument("--stream", action="store_true",
+                            help="pipe each posting through contacts and emails as soon as it is scraped")
+    run_parser.add_argument("--checkpoint", action="store_true",
+                            help="save each node's output and each finished item so the run can be resumed")
+    run_parser.add_argument("--resume", metavar="RUN_ID",
+                            help="continue a checkpointed run from its last completed item")
+
+    scrape_parser = commands.add_parser("scrape", parents=[common], help="scrape postings into a new run's output")
+    scrape_parser.add_argument("--run-id", help="name of the new run (default: a timestamped id)")
+    for name, help_text in (("enrich", "find contacts for a scraped run's postings"),
+                            ("generate", "draft emails for an enriched run"),
+                            ("report", "summarize a run's output and the latest metrics report")):
+        stage_parser = commands.add_parser(name, parents=[common], help=help_text)
+        stage_parser.add_argument("--run-id", help="run to work on (default: the most recently scraped)")
+    commands.choices["report"].add_argument("--metrics", metavar="PATH",
+                                            help="metrics report to summarize (default: the newest)")
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Without a command, e.g. `python main.py --stream`, run the whole pipeline as before.
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["run", *argv]
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.stream and (args.checkpoint or args.resume):
+        parser.error("--stream cannot be combined with --checkpoint/--resume")
+
+    handlers = {'scrape': scrape, 'enrich': enrich, 'generate': generate, 'run': run, 'report': report}
+    configs = {}
+    try:
+        # report only reads local files, so it needs neither .env nor API keys.
+        configs = read_configs(args.config) if args.command == "report" else load_configs(args.config)
+        asyncio.run(handlers[args.command](configs, args))
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}", exc_info=True)
+        return 1
+    finally:
+        if args.command != "report":
+            write_metrics_report(configs)
+    return 0
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    sys.exit(main())
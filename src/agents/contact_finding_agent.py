@@ -1,19 +1,34 @@
 import os
-import requests
+import httpx
+import asyncio
 from typing import Dict, List
 import logging
 from tenacity import retry, stop_after_attempt, wait_exponential
 import re
 from urllib.parse import urlparse
 import time
+from src.utils.rate_limiter import AdaptiveBackoff, ProviderLimiter
+from src.utils.enrichment_cache import EnrichmentCache
+from src.utils.persistent_cache import MISS
+from src.utils.normalize import normalize_company_name
+from src.utils.metrics import METRICS
+from src.utils.micro_batcher import MicroBatcher
+from src.utils.sampled_logger import SampledLogger
+from src.utils.records import Contact
 
 logger = logging.getLogger(__name__)
 
+APOLLO_API_URL = "https://api.apollo.io/v1"
+PROXYCURL_API_URL = "https://nubela.co/proxycurl/api"
+APOLLO_BULK_MATCH_LIMIT = 10
+
 class ContactFinder:
     def __init__(self, configs: Dict):
         self.configs = configs
         self.apollo_api_key = configs['apollo_io']['api_key']
         self.proxycurl_api_key = configs['proxycurl']['api_key']
+        self.apollo_url = configs['apollo_io'].get('base_url', APOLLO_API_URL).rstrip('/')
+        self.proxycurl_url = configs['proxycurl'].get('base_url', PROXYCURL_API_URL).rstrip('/')
         self.target_roles = [
             "HR",
             "Human Resources",
@@ -21,23 +36,136 @@ class ContactFinder:
             "Talent Acquisition",
             "People Operations"
         ]
+        self.apollo_limiter = ProviderLimiter.from_configs(
+            'apollo', configs['apollo_io'], rate=1.0, burst=5, max_concurrency=5)
+        # Throttled or failing Apollo calls are retried; the shared backoff makes
+        # one 429 slow every worker down instead of each finding the limit alone.
+        self.apollo_backoff = AdaptiveBackoff(max_delay=configs['apollo_io'].get('max_backoff', 60.0))
+        self.apollo_max_attempts = configs['apollo_io'].get('max_attempts', 5)
+        self.proxycurl_limiter = ProviderLimiter.from_configs(
+            'proxycurl', configs['proxycurl'], rate=1.0, burst=5, max_concurrency=5)
+        self.cache = EnrichmentCache.from_configs(configs)
+        # Enrich requests from concurrent lookups are grouped into bulk_match calls.
+        self.bulk_enrich = configs['apollo_io'].get('bulk_enrich', True)
+        self.enrich_batcher = MicroBatcher(
+            self._apollo_bulk_match,
+            batch_size=min(configs['apollo_io'].get('bulk_batch_size', APOLLO_BULK_MATCH_LIMIT), APOLLO_BULK_MATCH_LIMIT),
+            max_wait=configs['apollo_io'].get('bulk_max_wait', 0.05),
+        )
+        self.diagnostics = SampledLogger(logger, every=configs.get('logging', {}).get('sample_every', 100))
+        self._http_client = None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def _make_proxycurl_request(self, url: str, params: Dict) -> Dict:
-        headers = {"Authorization": f"Bearer {self.proxycurl_api_key}"}
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            max_connections = self.apollo_limiter.max_concurrency + self.proxycurl_limiter.max_concurrency
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections),
+            )
+        return self._http_client
+
+    async def aclose(self):
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
-    def find_contact_apollo(self, company_name: str) -> Dict:
-        search_url = "https://api.apollo.io/v1/mixed_people/search"
-        enrich_url = "https://api.apollo.io/v1/people/enrich"
-        headers = {
+    def _apollo_headers(self) -> Dict:
+        return {
             "Content-Type": "application/json",
             "Cache-Control": "no-cache",
             "X-Api-Key": self.apollo_api_key
         }
-        
+
+    @staticmethod
+    def _cacheable_person(person: Dict) -> Dict:
+        fields = ('first_name', 'last_name', 'title', 'email', 'linkedin_url')
+        return {field: person.get(field) for field in fields if person.get(field)}
+
+    @staticmethod
+    def _contact_from_apollo_person(person: Dict, company_name: str) -> Dict:
+        return {
+            'first_name': person.get('first_name', ''),
+            'last_name': person.get('last_name', ''),
+            'full_name': f"{person.get('first_name', '')} {person.get('last_name', '')}".strip(),
+            'position': person.get('title', ''),
+            'company_name': company_name,
+            'email': person.get('email', ''),
+            'linkedin_url': person.get('linkedin_url', ''),
+            'source': 'Apollo.io'
+        }
+
+    @staticmethod
+    def _proxycurl_fields(enrich_response: Dict) -> Dict:
+        return {
+            'country': enrich_response.get('country'),
+            'city': enrich_response.get('city'),
+            'state': enrich_response.get('state'),
+            'industry': enrich_response.get('industry'),
+            'company_domain': enrich_response.get('company_domain'),
+            'source': 'Apollo.io + Proxycurl'
+        }
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return isinstance(error, httpx.TransportError)
+
+    @staticmethod
+    def _retry_after(error: Exception) -> float:
+        try:
+            return float(error.response.headers.get('retry-after'))
+        except (AttributeError, RuntimeError, TypeError, ValueError):
+            return None
+
+    async def _apollo_post(self, url: str, payload: Dict, operation: str) -> Dict:
+        for attempt in range(1, self.apollo_max_attempts + 1):
+            await self.apollo_backoff.pause()
+            try:
+                async with self.apollo_limiter:
+                    with METRICS.timer('external_call', provider='apollo', operation=operation):
+                        response = await self._get_http_client().post(url, headers=self._apollo_headers(), json=payload)
+                        response.raise_for_status()
+            except Exception as e:
+                if attempt == self.apollo_max_attempts or not self._is_retryable(e):
+                    raise
+                METRICS.incr('external_call_retries_total', provider='apollo', operation=operation)
+                delay = self.apollo_backoff.on_throttled(self._retry_after(e))
+                logger.warning(f"Apollo.io {operation} failed ({type(e).__name__}), "
+                               f"attempt {attempt}/{self.apollo_max_attempts}; backing off {delay:.1f}s")
+                continue
+            self.apollo_backoff.on_success()
+            return response.json()
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           before_sleep=METRICS.retry_hook('proxycurl', 'linkedin'))
+    async def _make_proxycurl_request_async(self, url: str, params: Dict) -> Dict:
+        headers = {"Authorization": f"Bearer {self.proxycurl_api_key}"}
+        async with self.proxycurl_limiter:
+            with METRICS.timer('external_call', provider='proxycurl', operation='linkedin'):
+                response = await self._get_http_client().get(url, headers=headers, params=params)
+                response.raise_for_status()
+        return response.json()
+
+    async def _apollo_bulk_match(self, person_ids: List[str]) -> Dict[str, Dict]:
+        result = await self._apollo_post(f"{self.apollo_url}/people/bulk_match",
+                                         {"details": [{"id": person_id} for person_id in person_ids]}, 'bulk_match')
+        matches = (result or {}).get('matches') or []
+        self.diagnostics.debug('apollo_bulk_match', "Apollo.io bulk_match resolved %d of %d people",
+                               sum(1 for match in matches if match), len(person_ids))
+        # Key each match on its own id: Apollo may leave out or reorder people it
+        # couldn't resolve, so position says nothing about whose match it is.
+        requested = set(person_ids)
+        return {match['id']: match for match in matches if match and match.get('id') in requested}
+
+    async def _apollo_enrich(self, person_id: str) -> Dict:
+        if self.bulk_enrich:
+            return await self.enrich_batcher.get(person_id)
+        enrich_result = await self._apollo_post(f"{self.apollo_url}/people/enrich", {"id": person_id}, 'enrich')
+        return enrich_result.get('person')
+
+    async def find_contact_apollo_async(self, company_name: str) -> Dict:
         search_data = {
             "q_organization_name": company_name,
             "page": 1,
@@ -45,98 +173,113 @@ class ContactFinder:
             "person_titles": self.target_roles
         }
 
-        print(f"Apollo.io search data: {search_data}")
+        company_key = normalize_company_name(company_name)
 
-        try:
-            search_response = requests.post(search_url, headers=headers, json=search_data)
-            search_response.raise_for_status()
-            search_result = search_response.json()
-            print(f"Apollo.io search result: {search_result}")
-
-            if search_result and 'people' in search_result and search_result['people']:
-                person = search_result['people'][0]
-                
-                # Use the enrich endpoint to get the email
-                enrich_data = {"id": person['id']}
-                enrich_response = requests.post(enrich_url, headers=headers, json=enrich_data)
-                enrich_response.raise_for_status()
-                enrich_result = enrich_response.json()
-                print(f"Apollo.io enrich result: {enrich_result}")
-                
-                if 'person' in enrich_result:
-                    enriched_person = enrich_result['person']
-                    return {
-                        'first_name': enriched_person.get('first_name', ''),
-                        'last_name': enriched_person.get('last_name', ''),
-                        'full_name': f"{enriched_person.get('first_name', '')} {enriched_person.get('last_name', '')}".strip(),
-                        'position': enriched_person.get('title', ''),
-                        'company_name': company_name,
-                        'email': enriched_person.get('email', ''),
-                        'linkedin_url': enriched_person.get('linkedin_url', ''),
-                        'source': 'Apollo.io'
-                    }
-
-            print(f"No matching contact found in Apollo.io for {company_name}")
-        except Exception as e:
-            print(f"Error in Apollo.io request for {company_name}: {str(e)}")
-        
+        # {} means Apollo answered and had nobody; request errors propagate so
+        # the caller can tell a failed lookup (worth retrying) from a miss.
+        person_id = self.cache.get('apollo_search', company_key)
+        if person_id is MISS:
+            search_result = await self._apollo_post(f"{self.apollo_url}/mixed_people/search", search_data, 'search')
+            people = (search_result or {}).get('people') or []
+            self.diagnostics.debug('apollo_search', "Apollo.io search for %s returned %d people",
+                                   company_name, len(people))
+            person_id = people[0]['id'] if people else None
+            self.cache.set('apollo_search', company_key, person_id)
+
+        if person_id:
+            person = self.cache.get('apollo_enrich', person_id)
+            if person is MISS:
+                match = await self._apollo_enrich(person_id)
+                person = self._cacheable_person(match) if match else None
+                self.cache.set('apollo_enrich', person_id, person)
+            if person:
+                return self._contact_from_apollo_person(person, company_name)
+
+        self.diagnostics.info('apollo_no_match', "No matching contact found in Apollo.io for %s", company_name)
         return {}
 
-    def enrich_with_proxycurl(self, contact_info: Dict) -> Dict:
+    async def enrich_with_proxycurl_async(self, contact_info: Dict) -> Dict:
         if not contact_info.get('linkedin_url'):
-            print(f"No LinkedIn URL available for {contact_info.get('full_name')}")
+            self.diagnostics.info('proxycurl_no_url', "No LinkedIn URL available for %s", contact_info.get('full_name'))
             return contact_info
 
-        print(f"Attempting Proxycurl enrichment for {contact_info['full_name']}...")
-        
-        enrich_url = "https://nubela.co/proxycurl/api/v2/linkedin"
-        enrich_params = {'url': contact_info['linkedin_url']}
-        
-        try:
-            enrich_response = self._make_proxycurl_request(enrich_url, enrich_params)
-            
-            if enrich_response:
-                contact_info.update({
-                    'country': enrich_response.get('country'),
-                    'city': enrich_response.get('city'),
-                    'state': enrich_response.get('state'),
-                    'industry': enrich_response.get('industry'),
-                    'company_domain': enrich_response.get('company_domain'),
-                    'source': 'Apollo.io + Proxycurl'
-                })
-                print(f"Proxycurl enrichment successful for {contact_info['full_name']}")
-            else:
-                print(f"Proxycurl couldn't enrich data for {contact_info['full_name']}")
-        except Exception as e:
-            print(f"Error in Proxycurl enrichment for {contact_info['full_name']}: {str(e)}")
-        
+        enrich_response = self.cache.get('proxycurl', contact_info['linkedin_url'])
+        if enrich_response is MISS:
+            enrich_response = await self._make_proxycurl_request_async(
+                f"{self.proxycurl_url}/v2/linkedin", {'url': contact_info['linkedin_url']})
+            enrich_response = self._proxycurl_fields(enrich_response) if enrich_response else None
+            self.cache.set('proxycurl', contact_info['linkedin_url'], enrich_response)
+        if enrich_response:
+            contact_info.update(enrich_response)
+        else:
+            self.diagnostics.info('proxycurl_no_data', "Proxycurl couldn't enrich data for %s",
+                                  contact_info['full_name'])
+
         return contact_info
 
-    def find_contact(self, job: Dict) -> Dict:
+    async def find_contact_async(self, job: Dict) -> Dict:
         company_name = job['company_name']
-        
-        print(f"Finding contact for {company_name}...")
-        
-        contact_info = self.find_contact_apollo(company_name)
+
+        contact_info = await self.find_contact_apollo_async(company_name)
         if contact_info:
-            if contact_info.get('email'):
-                print(f"Apollo.io found email for {company_name}: {contact_info['email']}")
-            enriched_info = self.enrich_with_proxycurl(contact_info)
+            enriched_info = await self.enrich_with_proxycurl_async(contact_info)
             return {'company_name': company_name, 'contact_info': enriched_info}
-        
-        print(f"No valid contact found for {company_name}")
+
+        self.diagnostics.info('no_contact', "No valid contact found for %s", company_name)
         return {'company_name': company_name, 'contact_info': {}}
 
-def contact_finding_agent(configs: Dict):
+def contact_finding_agent(configs: Dict, checkpoint=None, output=None):
     finder = ContactFinder(configs)
+    workers = configs.get('contact_finding', {}).get('workers', 10)
+
+    async def run(state: Dict) -> Dict:
+        logger.info("Starting contact finding...")
+        job_postings = state.get('job_postings', [])
+
+        # Several postings usually share an employer; look each one up once.
+        companies = {}
+        for job in job_postings:
+            companies.setdefault(job.company_key, job)
+        logger.info(f"{len(job_postings)} job postings from {len(companies)} distinct companies")
 
-    def run(state: Dict) -> Dict:
-        print("Starting contact finding...")
         contacts = []
-        for job in state.get('job_postings', []):
-            contact_info = finder.find_contact(job)
-            contacts.append(contact_info)
-        print(f"Found contact information for {len(contacts)} companies")
-        return {"job_postings": state['job_postings'], "contacts": contacts}
+        queue = asyncio.Queue()
+        for company_key, job in companies.items():
+            queue.put_nowait((company_key, job))
+
+        async def worker():
+            while not queue.empty():
+                company_key, job = queue.get_nowait()
+                saved = checkpoint.get(company_key) if checkpoint else MISS
+                if saved is MISS:
+                    try:
+                        found = await finder.find_contact_async(job)
+                    except Exception as e:
+                        # Left out of the result, so the email node can tell a failed
+                        # lookup from one that settled without finding anybody.
+                        logger.error(f"Contact lookup failed for {job.company_name}: {str(e)}")
+                        if checkpoint:
+                            checkpoint.fail(company_key)
+                        continue
+                    else:
+                        contact = Contact.from_lookup(company_key, job.company_name, found['contact_info'])
+                        if checkpoint:
+                            checkpoint.put(company_key, contact)
+                        # Only settled lookups are written; a failed one is retried on
+                        # resume, and restored contacts were written by the run that found them.
+                        if output is not None:
+                            output.contacts.write(contact)
+                else:
+                    contact = Contact.from_dict(saved)
+                contacts.append(contact)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(workers, len(companies)))))
+        finally:
+            await finder.aclose()
+        finder.cache.log_stats()
+
+        logger.info(f"Found contact information for {len(contacts)} companies")
+        return {"contacts": contacts}
 
     return run
\ No newline at end of file
@@ -1,101 +1,243 @@
 # src/agents/email_outreach_agent.py
 
-from typing import Dict, List
-import anthropic
+import asyncio
+import time
+from typing import Dict, List, Optional
 import logging
 from datetime import datetime, timedelta
+from src.utils.persistent_cache import MISS
+from src.utils.metrics import METRICS
+from src.utils.rate_limiter import AdaptiveBackoff
+from src.utils.message_batches import MessageBatchRunner
+from src.utils.email_prompt import EmailPromptBuilder, TokenUsage
+from src.utils.response_cache import ResponseCache, fill_template, to_template
+from src.utils.records import Contact, JobPosting, PreparedEmail
+from src.utils.seen_postings import SeenPostings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class EmailOutreachAgent:
-    def __init__(self, configs: Dict):
+    def __init__(self, configs: Dict, batch_client=None):
         self.configs = configs
-        self.client = anthropic.Anthropic(api_key=configs['anthropic']['api_key'])
+        anthropic_configs = configs['anthropic']
+        self.mode = anthropic_configs.get('mode', 'realtime')
+        self.api_key = anthropic_configs['api_key']
+        self.base_url = anthropic_configs.get('base_url')
+        self.semaphore = asyncio.Semaphore(anthropic_configs.get('max_concurrency', 5))
+        self.backoff = AdaptiveBackoff(max_delay=anthropic_configs.get('max_backoff', 60.0))
+        self.request_timeout = anthropic_configs.get('request_timeout', 120.0)
+        self.max_attempts = anthropic_configs.get('max_attempts', 6)
+        # Streamed responses are what let time-to-first-token be measured.
+        self.stream = anthropic_configs.get('stream', True)
+        self.batch_client = batch_client
+        self.prompt_builder = EmailPromptBuilder.from_configs(configs)
+        self.token_usage = TokenUsage()
         self.email_sequences = configs['email_sequences']
-        self.template_cache = {}
-
-    def generate_email_content(self, job_posting: Dict, contact_info: Dict, sequence: str) -> str:
-        cache_key = f"{job_posting['job_title']}_{job_posting['company_name']}_{sequence}"
-        if cache_key in self.template_cache:
-            return self.template_cache[cache_key]
-
-        prompt = f"""
-        Generate a personalized email for a {sequence} outreach based on the following:
-        Job Title: {job_posting['job_title']}
-        Company: {job_posting['company_name']}
-        Job Description: {job_posting['job_description']}
-        Contact Name: {contact_info.get('first_name', '')} {contact_info.get('last_name', '')}
-        Contact Position: {contact_info.get('position', '')}
-        Contact Email: {contact_info.get('email', '')}
-        Contact LinkedIn: {contact_info.get('linkedin_url', '')}
-        Contact Location: {contact_info.get('city', '')}, {contact_info.get('state', '')}, {contact_info.get('country', '')}
-        Company Industry: {contact_info.get('organization', {}).get('industry', '')}
-
-        Create an email with the following structure:
-        Subject: [Compelling subject line related to the job posting]
-
-        [Brief, personalized introduction mentioning the contact's name and position]
-        [Statement about working with an exceptional candidate for the specific job posting]
-        [Offer to discuss other hiring needs if this candidate isn't the right fit]
-        [Concise, bullet-point candidate summary tailored to the job requirements]
-        [Call to action asking if they'd like to review the resume]
-        [Closing with a way to reach you]
-
-        Ensure the email is concise, tailored to the specific job and contact, and presents a compelling case for the candidate.
-        The candidate summary should be believable and match the job requirements closely.
-        """
-        message = self.client.messages.create(
-            model="claude-3-5-sonnet-20240620",
-            max_tokens=4096,
-            temperature=0.7,
-            system="You are an AI assistant tasked with creating personalized email templates for job prospecting. Your emails should be concise, tailored, and focused on presenting a strong candidate for the specific job opportunity.",
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+        self.response_cache = ResponseCache.from_configs(configs)
+        # The anthropic SDK is slow to import, and a run served entirely from
+        # the response cache never needs it; clients are built on first use.
+        self._async_client = None
+        self._batch_runner = None
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            import anthropic
+            # Retries are handled by the shared backoff rather than per call.
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        return self._async_client
+
+    def _get_batch_runner(self) -> MessageBatchRunner:
+        if self._batch_runner is None:
+            anthropic_configs = self.configs['anthropic']
+            self._batch_runner = MessageBatchRunner(
+                self.batch_client or self._get_async_client(),
+                checkpoint_path=anthropic_configs.get('batch_checkpoint', '.cache/email_batch.json'),
+                poll_interval=anthropic_configs.get('batch_poll_interval', 60.0),
+            )
+        return self._batch_runner
+
+    @staticmethod
+    def _is_throttled(error: Exception) -> bool:
+        # 429 is a rate limit, 529 means the API is overloaded. Any such error
+        # came from a client, so the SDK is already imported here.
+        import anthropic
+        return isinstance(error, anthropic.APIStatusError) and error.status_code in (429, 529)
+
+    @staticmethod
+    def _retry_after(error: Exception) -> float:
+        try:
+            return float(error.response.headers.get('retry-after'))
+        except (TypeError, ValueError):
+            return None
+
+    async def _create_message(self, params: Dict):
+        client = self._get_async_client()
+        if not self.stream:
+            return await client.messages.create(**params)
+        started = time.perf_counter()
+        first_token = None
+        async with client.messages.stream(**params) as stream:
+            async for event in stream:
+                if first_token is None and event.type == 'content_block_delta':
+                    first_token = time.perf_counter() - started
+            message = await stream.get_final_message()
+        if first_token is not None:
+            self.token_usage.record_first_token(first_token)
+        return message
+
+    async def generate_email_content_async(self, job_posting: Dict, contact_info: Dict, sequence: str) -> str:
+        cached = self.response_cache.get(job_posting, contact_info, sequence)
+        if cached is not None:
+            return cached
+
+        params = self.prompt_builder.build(job_posting, contact_info, sequence)
+        for attempt in range(1, self.max_attempts + 1):
+            await self.backoff.pause()
+            try:
+                async with self.semaphore:
+                    with METRICS.timer('external_call', provider='anthropic', operation='messages'):
+                        message = await asyncio.wait_for(self._create_message(params), timeout=self.request_timeout)
+            except Exception as e:
+                if attempt == self.max_attempts or not (self._is_throttled(e) or isinstance(e, asyncio.TimeoutError)):
+                    raise
+                METRICS.incr('external_call_retries_total', provider='anthropic', operation='messages')
+                delay = self.backoff.on_throttled(self._retry_after(e) if self._is_throttled(e) else None)
+                logger.warning(f"Claude request for {job_posting['company_name']} failed ({type(e).__name__}), "
+                               f"attempt {attempt}/{self.max_attempts}; backing off {delay:.1f}s")
+                continue
+            self.backoff.on_success()
+            self.token_usage.record(message.usage, job_posting['company_name'])
+            break
 
         content = message.content[0].text
-        self.template_cache[cache_key] = content
+        self.response_cache.put(job_posting, contact_info, sequence, content)
         return content
 
-def email_outreach_agent(configs: Dict):
-    agent = EmailOutreachAgent(configs)
+    async def generate_email_contents_batch(self, items: List[tuple], sequence: str) -> List[str]:
+        # One batch request per distinct (normalized) job; postings that share it
+        # get the generated email refilled with their own fields.
+        contents = [self.response_cache.get(job_posting, contact_info, sequence) for job_posting, contact_info in items]
+        requests = {}
+        for (job_posting, contact_info), content in zip(items, contents):
+            if content is None:
+                custom_id = ResponseCache.exact_key(job_posting, sequence)
+                if custom_id not in requests:
+                    requests[custom_id] = (job_posting, contact_info, self.prompt_builder.build(job_posting, contact_info, sequence))
+
+        results = await self._get_batch_runner().run({custom_id: params for custom_id, (_, _, params) in requests.items()})
+        templates = {}
+        for custom_id, (job_posting, contact_info, _) in requests.items():
+            if custom_id in results:
+                message = results[custom_id]
+                self.token_usage.record(message.usage, job_posting['company_name'])
+                content = message.content[0].text
+                self.response_cache.put(job_posting, contact_info, sequence, content)
+                templates[custom_id] = to_template(content, job_posting, contact_info)
+
+        for index, (job_posting, contact_info) in enumerate(items):
+            template = templates.get(ResponseCache.exact_key(job_posting, sequence))
+            if contents[index] is None and template is not None:
+                contents[index] = fill_template(template, job_posting, contact_info)
+        return contents
 
-    def run(state: Dict) -> Dict:
+def build_prepared_email(job: JobPosting, contact: Contact, email_content: str, sequence: str) -> PreparedEmail:
+    return PreparedEmail(
+        job_id=job.id,
+        contact_id=contact.company_key,
+        to_email=contact.email,
+        subject=email_content.split('\n')[0].replace('Subject: ', ''),
+        content='\n'.join(email_content.split('\n')[1:]),
+        sequence=sequence,
+    )
+
+def index_contacts(contacts: List[Contact]) -> Dict[str, Contact]:
+    return {contact.company_key: contact for contact in contacts}
+
+def email_outreach_agent(configs: Dict, batch_client=None, checkpoint=None, output=None):
+    agent = EmailOutreachAgent(configs, batch_client=batch_client)
+    seen = SeenPostings.from_configs(configs)
+
+    def item_key(job: JobPosting) -> str:
+        return f"{job.id}:initial_outreach"
+
+    def finished(job: JobPosting, email: PreparedEmail):
+        if checkpoint:
+            checkpoint.put(item_key(job), email)
+        if output is not None:
+            output.prepared_emails.write(email)
+        if seen is not None:
+            seen.add_many([job])
+
+    async def prepare_email(job: JobPosting, contact: Contact) -> Optional[PreparedEmail]:
+        try:
+            email_content = await agent.generate_email_content_async(job, contact, 'initial_outreach')
+        except Exception as e:
+            logger.error(f"Email generation failed for {job.company_name}: {str(e)}")
+            if checkpoint:
+                checkpoint.fail(item_key(job))
+            return None
+        email = build_prepared_email(job, contact, email_content, 'initial_outreach')
+        finished(job, email)
+        return email
+
+    async def run(state: Dict) -> Dict:
         logger.info("Starting email outreach preparation...")
         job_postings = state.get('job_postings', [])
-        contacts = state.get('contacts', [])
+        contacts_by_company = index_contacts(state.get('contacts', []))
+        items = []
         prepared_emails = []
+        nobody_to_email = []
 
+        # A posting counts as processed (seen) once its email exists, or once its
+        # contact lookup settled without finding anybody to email. Postings whose
+        # lookup failed have no contact at all, and like failed emails they stay
+        # unseen so the next run retries them.
         for job in job_postings:
-            company_name = job['company_name']
-            contact_info = next((contact['contact_info'] for contact in contacts if contact['company_name'] == company_name), {})
+            contact = contacts_by_company.get(job.company_key)
             
-            if contact_info and contact_info.get('email'):
-                email_content = agent.generate_email_content(job, contact_info, 'initial_outreach')
-                
-                prepared_emails.append({
-                    'to_email': contact_info['email'],
-                    'subject': email_content.split('\n')[0].replace('Subject: ', ''),
-                    'content': '\n'.join(email_content.split('\n')[1:]),
-                    'sequence': 'initial_outreach',
-                    'job': job,
-                    'contact_info': contact_info
-                })
+            if contact is not None and contact.email:
+                saved = checkpoint.get(item_key(job)) if checkpoint else MISS
+                if saved is MISS:
+                    items.append((job, contact))
+                else:
+                    prepared_emails.append(PreparedEmail.from_dict(saved))
             else:
-                logger.warning(f"No email found for job at {company_name}")
+                logger.warning(f"No email found for job at {job.company_name}")
+                if contact is not None:
+                    nobody_to_email.append(job)
+        if seen is not None:
+            seen.add_many(nobody_to_email)
+
+        if prepared_emails:
+            logger.info(f"Restored {len(prepared_emails)} emails from checkpoint")
+
+        if agent.mode == 'batch':
+            contents = await agent.generate_email_contents_batch(items, 'initial_outreach')
+            for (job, contact), content in zip(items, contents):
+                if content is not None:
+                    email = build_prepared_email(job, contact, content, 'initial_outreach')
+                    finished(job, email)
+                    prepared_emails.append(email)
+                elif checkpoint:
+                    checkpoint.fail(item_key(job))
+        else:
+            # Each email is generated independently; a failure only drops that email.
+            emails = await asyncio.gather(*(prepare_email(job, contact) for job, contact in items))
+            prepared_emails.extend(email for email in emails if email is not None)
 
         logger.info(f"Prepared {len(prepared_emails)} personalized emails")
+        agent.token_usage.log_summary()
+        agent.response_cache.log_stats()
         
         # Print prepared emails
         for i, email in enumerate(prepared_emails, 1):
             logger.info(f"\nEmail {i}:")
-            logger.info(f"To: {email['to_email']}")
-            logger.info(f"Subject: {email['subject']}")
-            logger.info(f"Content:\n{email['content']}")
+            logger.info(f"To: {email.to_email}")
+            logger.info(f"Subject: {email.subject}")
+            logger.info(f"Content:\n{email.content}")
             logger.info("-" * 50)
 
-        return {"job_postings": state['job_postings'], "contacts": state['contacts'], "prepared_emails": prepared_emails}
+        return {"prepared_emails": prepared_emails}
 
     return run
\ No newline at end of file
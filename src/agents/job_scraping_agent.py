@@ -1,21 +1,35 @@
 # src/agents/job_scraping_agent.py
 
-from src.utils.indeed_scraper import scrape_indeed
-import json
+from src.utils.indeed_scraper import scrape_indeed, scrape_indeed_async
+from src.utils.scrape_orchestrator import scrape_searches
+import asyncio
 import logging
+from src.utils.records import dump_json_array
+from src.utils.seen_postings import SeenPostings
 
 logger = logging.getLogger(__name__)
 
-def job_scraping_agent(configs):
-    def run(state):
+def job_scraping_agent(configs, output=None):
+    seen = SeenPostings.from_configs(configs)
+    # Each page's new postings are appended to the run's JSONL output as soon as it is parsed.
+    on_page = output.job_postings.write_many if output is not None else None
+    # The old single-file dump, for scripts that still read it; off unless configured.
+    job_posts_json = configs.get('output', {}).get('job_posts_json')
+
+    async def run(state):
         logger.info("Starting job scraping...")
-        job_postings = scrape_indeed(configs)
-        logger.info(f"Scraped {len(job_postings)} job postings")
-        
-        # Save job postings to JSON file
-        with open("job_posts.json", "w") as f:
-            json.dump(job_postings, f, indent=4)
-        logger.info("Job postings saved to job_posts.json")
-        
+        if configs['indeed'].get('searches'):
+            job_postings = await scrape_searches(configs, on_page)
+        elif configs['indeed'].get('concurrency', 1) > 1:
+            job_postings = await scrape_indeed_async(configs, seen, on_page)
+        else:
+            job_postings = await asyncio.to_thread(scrape_indeed, configs, seen, on_page)
+        logger.info(f"Scraped {len(job_postings)} new job postings")
+        if job_posts_json:
+            with open(job_posts_json, "w") as f:
+                dump_json_array(job_postings, f)
+            logger.info(f"Job postings saved to {job_posts_json}")
+        # Postings are marked seen by the email node once their email exists,
+        # so a crash or failed lookup here leaves them to be picked up again.
         return {"job_postings": job_postings}
-    return run
\ No newline at end of file
+    return run
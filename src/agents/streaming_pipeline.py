@@ -0,0 +1,133 @@
+# src/agents/streaming_pipeline.py
+
+import asyncio
+import logging
+from collections import Counter
+from contextlib import aclosing
+from typing import Callable, Dict
+
+from src.agents.contact_finding_agent import ContactFinder
+from src.agents.email_outreach_agent import EmailOutreachAgent, build_prepared_email
+from src.utils.indeed_scraper import stream_indeed_pages
+from src.utils.records import Contact, JobPosting, PreparedEmail
+from src.utils.scrape_orchestrator import search_configs
+from src.utils.seen_postings import SeenPostings
+
+logger = logging.getLogger(__name__)
+
+async def run_streaming_pipeline(configs: Dict, on_email: Callable[[PreparedEmail], None], output=None) -> Dict:
+    # Scrape -> contacts -> emails with bounded queues between the stages, so
+    # each posting moves on as soon as it is parsed and a slow stage holds back
+    # the ones before it instead of letting work pile up in memory.
+    streaming_configs = configs.get('streaming', {})
+    queue_size = streaming_configs.get('queue_size', 50)
+    contact_workers = configs.get('contact_finding', {}).get('workers', 10)
+    email_workers = streaming_configs.get('email_workers', configs['anthropic'].get('max_concurrency', 5))
+
+    finder = ContactFinder(configs)
+    seen = SeenPostings.from_configs(configs)
+    agent = EmailOutreachAgent(configs)
+    postings = asyncio.Queue(maxsize=queue_size)
+    ready = asyncio.Queue(maxsize=queue_size)
+    lookups = {}
+    stats = Counter()
+
+    async def find_contact(job: JobPosting) -> Contact:
+        found = await finder.find_contact_async(job)
+        contact = Contact.from_lookup(job.company_key, job.company_name, found['contact_info'])
+        if output is not None:
+            output.contacts.write(contact)
+        return contact
+
+    async def lookup(job: JobPosting) -> Contact:
+        # Postings from the same company share one in-flight lookup; once it
+        # settles only the contact is kept, not the finished future.
+        known = lookups.get(job.company_key)
+        if known is None:
+            known = lookups[job.company_key] = asyncio.ensure_future(find_contact(job))
+            stats['companies'] += 1
+        if isinstance(known, Contact):
+            return known
+        if isinstance(known, Exception):
+            raise known
+        try:
+            contact = await known
+        except Exception as e:
+            # Later postings from this company fail the same way rather than
+            # repeating the lookup, and stay unseen along with this one.
+            lookups[job.company_key] = e
+            raise
+        lookups[job.company_key] = contact
+        return contact
+
+    async def find_contacts():
+        while (job := await postings.get()) is not None:
+            try:
+                contact = await lookup(job)
+            except Exception as e:
+                # Left unseen, so the next run looks it up again.
+                logger.error(f"Contact lookup failed for {job.company_name}: {str(e)}")
+                continue
+            if contact.email:
+                await ready.put((job, contact))
+            else:
+                logger.warning(f"No email found for job at {job.company_name}")
+                # The lookup settled with nobody to email: nothing left to do for this posting.
+                if seen is not None:
+                    seen.add_many([job])
+
+    async def prepare_email(job: JobPosting, contact: Contact):
+        email_content = await agent.generate_email_content_async(job, contact, 'initial_outreach')
+        email = build_prepared_email(job, contact, email_content, 'initial_outreach')
+        if output is not None:
+            output.prepared_emails.write(email)
+        if seen is not None:
+            seen.add_many([job])
+        stats['prepared_emails'] += 1
+        on_email(email)
+
+    async def prepare_emails():
+        while (item := await ready.get()) is not None:
+            job, contact = item
+            # A failure must only drop this email: a dead worker stops draining
+            # `ready`, and once all are dead the contact workers block on it.
+            try:
+                await prepare_email(job, contact)
+            except Exception as e:
+                logger.error(f"Email preparation failed for {job.company_name}: {str(e)}")
+
+    contact_tasks = [asyncio.create_task(find_contacts()) for _ in range(contact_workers)]
+    email_tasks = [asyncio.create_task(prepare_emails()) for _ in range(email_workers)]
+
+    try:
+        # Searches run one after another here; overlapping searches often
+        # return the same posting, so each one is dispatched only once.
+        dispatched = set()
+        for search in search_configs(configs):
+            async with aclosing(stream_indeed_pages(search, seen)) as pages:
+                async for page in pages:
+                    for job in page:
+                        if job.id in dispatched:
+                            continue
+                        dispatched.add(job.id)
+                        stats['job_postings'] += 1
+                        if output is not None:
+                            output.job_postings.write(job)
+                        await postings.put(job)
+    finally:
+        for _ in contact_tasks:
+            await postings.put(None)
+        await asyncio.gather(*contact_tasks)
+        for _ in email_tasks:
+            await ready.put(None)
+        await asyncio.gather(*email_tasks)
+        await finder.aclose()
+
+    finder.cache.log_stats()
+    agent.token_usage.log_summary()
+    agent.response_cache.log_stats()
+    return {
+        'job_postings': stats['job_postings'],
+        'companies': stats['companies'],
+        'prepared_emails': stats['prepared_emails'],
+    }
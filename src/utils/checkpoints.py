@@ -0,0 +1,138 @@
+# src/utils/checkpoints.py
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from src.utils.persistent_cache import MISS
+from src.utils.records import to_jsonable
+
+logger = logging.getLogger(__name__)
+
+
+def new_run_id() -> str:
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+class CheckpointStore:
+    """Per-run SQLite record of finished graph nodes and finished items within a node."""
+
+    def __init__(self, path: str = '.cache/checkpoints.sqlite3'):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id TEXT PRIMARY KEY, status TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS node_results ("
+            "run_id TEXT NOT NULL, node TEXT NOT NULL, state TEXT NOT NULL, saved_at REAL NOT NULL, "
+            "PRIMARY KEY (run_id, node));"
+            "CREATE TABLE IF NOT EXISTS item_results ("
+            "run_id TEXT NOT NULL, node TEXT NOT NULL, item_key TEXT NOT NULL, result TEXT NOT NULL, "
+            "saved_at REAL NOT NULL, PRIMARY KEY (run_id, node, item_key));"
+        )
+
+    @classmethod
+    def from_configs(cls, configs: Dict) -> "CheckpointStore":
+        return cls(configs.get('checkpoints', {}).get('path', '.cache/checkpoints.sqlite3'))
+
+    def _execute(self, query: str, params=()):
+        with self.lock:
+            return self.connection.execute(query, params).fetchall()
+
+    def start_run(self, run_id: str = None) -> str:
+        run_id = run_id or new_run_id()
+        now = time.time()
+        self._execute(
+            "INSERT INTO runs (run_id, status, created_at, updated_at) VALUES (?, 'running', ?, ?) "
+            "ON CONFLICT (run_id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at",
+            (run_id, now, now),
+        )
+        return run_id
+
+    def run_status(self, run_id: str) -> Optional[str]:
+        rows = self._execute("SELECT status FROM runs WHERE run_id = ?", (run_id,))
+        return rows[0][0] if rows else None
+
+    def finish_run(self, run_id: str, status: str = 'completed'):
+        self._execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), run_id))
+
+    def node_result(self, run_id: str, node: str) -> Optional[Dict]:
+        rows = self._execute("SELECT state FROM node_results WHERE run_id = ? AND node = ?", (run_id, node))
+        return json.loads(rows[0][0]) if rows else None
+
+    def completed_nodes(self, run_id: str) -> set:
+        return {row[0] for row in self._execute("SELECT node FROM node_results WHERE run_id = ?", (run_id,))}
+
+    def save_node_result(self, run_id: str, node: str, state: Dict):
+        self._execute(
+            "INSERT OR REPLACE INTO node_results (run_id, node, state, saved_at) VALUES (?, ?, ?, ?)",
+            (run_id, node, json.dumps(state, default=to_jsonable), time.time()),
+        )
+
+    def scope(self, run_id: str, node: str) -> "NodeCheckpoint":
+        return NodeCheckpoint(self, run_id, node)
+
+
+class NodeCheckpoint:
+    def __init__(self, store: CheckpointStore, run_id: str, node: str):
+        self.store = store
+        self.run_id = run_id
+        self.node = node
+        # Items that failed in this invocation. While any remain, the node's
+        # result isn't saved, so a resume runs the node again and retries them.
+        self.failed = set()
+
+    def get(self, item_key: str):
+        rows = self.store._execute(
+            "SELECT result FROM item_results WHERE run_id = ? AND node = ? AND item_key = ?",
+            (self.run_id, self.node, item_key),
+        )
+        return json.loads(rows[0][0]) if rows else MISS
+
+    def put(self, item_key: str, result):
+        self.store._execute(
+            "INSERT OR REPLACE INTO item_results (run_id, node, item_key, result, saved_at) VALUES (?, ?, ?, ?, ?)",
+            (self.run_id, self.node, item_key, json.dumps(result, default=to_jsonable), time.time()),
+        )
+        self.failed.discard(item_key)
+
+    def fail(self, item_key: str):
+        self.failed.add(item_key)
+
+
+def checkpointed_node(store: CheckpointStore, run_id: str, node: str, run: Callable,
+                      decode: Callable = None, checkpoint: NodeCheckpoint = None,
+                      requires: Iterable[str] = ()) -> Callable:
+    # decode turns a restored (JSON) result back into what the node returns.
+    # checkpoint is the node's item scope; items that failed in it keep the
+    # node from being saved as complete. So does any node in requires (those
+    # upstream of it) being incomplete: a resume may change its input.
+    async def wrapper(state: Dict) -> Dict:
+        saved = store.node_result(run_id, node)
+        if saved is not None:
+            logger.info(f"Restored {node} from checkpoint for run {run_id}")
+            return decode(saved) if decode else saved
+
+        result = run(state)
+        if asyncio.iscoroutine(result):
+            result = await result
+        if checkpoint is not None and checkpoint.failed:
+            logger.warning(f"{node} finished with {len(checkpoint.failed)} failed items; "
+                           f"not marking it complete so a resume retries them")
+            return result
+        if not set(requires) <= store.completed_nodes(run_id):
+            return result
+        store.save_node_result(run_id, node, result)
+        return result
+
+    return wrapper
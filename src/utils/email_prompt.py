@@ -0,0 +1,165 @@
+# src/utils/email_prompt.py
+
+import logging
+from typing import Dict
+
+from src.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = (
+    "You are an AI assistant tasked with creating personalized email templates for job prospecting. "
+    "Your emails should be concise, tailored, and focused on presenting a strong candidate for the "
+    "specific job opportunity."
+)
+
+# Everything that is identical for every email lives in the system prompt;
+# only the job and contact fields change per request.
+STRUCTURE_INSTRUCTIONS = """Each request gives you an outreach sequence, a job posting and a contact at the hiring company.
+
+Create an email with the following structure:
+Subject: [Compelling subject line related to the job posting]
+
+[Brief, personalized introduction mentioning the contact's name and position]
+[Statement about working with an exceptional candidate for the specific job posting]
+[Offer to discuss other hiring needs if this candidate isn't the right fit]
+[Concise, bullet-point candidate summary tailored to the job requirements]
+[Call to action asking if they'd like to review the resume]
+[Closing with a way to reach you]
+
+Ensure the email is concise, tailored to the specific job and contact, and presents a compelling case for the candidate.
+The candidate summary should be believable and match the job requirements closely.
+The first line of your reply must be the subject line."""
+
+# Rough but stable: English prose averages about four characters per token.
+CHARS_PER_TOKEN = 4
+
+# Anthropic ignores cache_control on prefixes shorter than this (Sonnet and
+# Opus; Haiku needs 2048).
+MIN_CACHEABLE_TOKENS = 1024
+
+
+def trim_to_tokens(text: str, token_budget: int) -> str:
+    text = " ".join((text or "").split())
+    max_chars = token_budget * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+class EmailPromptBuilder:
+    def __init__(self, model: str = "claude-3-5-sonnet-20240620", max_tokens: int = 4096,
+                 temperature: float = 0.7, description_token_budget: int = 300, cache_prefix: bool = True,
+                 min_cache_tokens: int = MIN_CACHEABLE_TOKENS):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.description_token_budget = description_token_budget
+        prefix = f"{SYSTEM_PROMPT}\n\n{STRUCTURE_INSTRUCTIONS}"
+        system_block = {"type": "text", "text": prefix}
+        # The shared prefix is about 270 tokens today, so it isn't marked: a
+        # marker below the minimum only makes every call a cache miss.
+        self.cache_prefix = cache_prefix and len(prefix) / CHARS_PER_TOKEN >= min_cache_tokens
+        if self.cache_prefix:
+            system_block["cache_control"] = {"type": "ephemeral"}
+        self.system = [system_block]
+
+    @classmethod
+    def from_configs(cls, configs: Dict) -> "EmailPromptBuilder":
+        anthropic_configs = configs['anthropic']
+        return cls(
+            model=anthropic_configs.get('model', "claude-3-5-sonnet-20240620"),
+            max_tokens=anthropic_configs.get('max_tokens', 4096),
+            temperature=anthropic_configs.get('temperature', 0.7),
+            description_token_budget=anthropic_configs.get('description_token_budget', 300),
+            cache_prefix=anthropic_configs.get('prompt_caching', True),
+            min_cache_tokens=anthropic_configs.get('prompt_cache_min_tokens', MIN_CACHEABLE_TOKENS),
+        )
+
+    def user_prompt(self, job_posting: Dict, contact_info: Dict, sequence: str) -> str:
+        location = ", ".join(filter(None, (contact_info.get(field) for field in ('city', 'state', 'country'))))
+        industry = contact_info.get('industry') or (contact_info.get('organization') or {}).get('industry')
+        fields = [
+            ("Sequence", sequence),
+            ("Job Title", job_posting['job_title']),
+            ("Company", job_posting['company_name']),
+            ("Job Description", trim_to_tokens(job_posting.get('job_description'), self.description_token_budget)),
+            ("Contact Name", f"{contact_info.get('first_name', '')} {contact_info.get('last_name', '')}".strip()),
+            ("Contact Position", contact_info.get('position')),
+            ("Contact Email", contact_info.get('email')),
+            ("Contact LinkedIn", contact_info.get('linkedin_url')),
+            ("Contact Location", location),
+            ("Company Industry", industry),
+        ]
+        return "\n".join(f"{name}: {value}" for name, value in fields if value)
+
+    def build(self, job_posting: Dict, contact_info: Dict, sequence: str) -> Dict:
+        params = dict(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=self.system,
+            messages=[
+                {"role": "user", "content": self.user_prompt(job_posting, contact_info, sequence)}
+            ]
+        )
+        # `temperature: null` in configs leaves it out. The anthropic 1.13.0
+        # SDK's Messages.create/stream take no temperature argument at all and
+        # raise TypeError when given one.
+        if self.temperature is not None:
+            params['temperature'] = self.temperature
+        return params
+
+
+class TokenUsage:
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.cache_creation_input_tokens = 0
+        self.cache_read_input_tokens = 0
+        self.output_tokens = 0
+        self.first_token_calls = 0
+        self.first_token_seconds = 0.0
+
+    def record_first_token(self, seconds: float):
+        self.first_token_calls += 1
+        self.first_token_seconds += seconds
+        METRICS.observe('llm_first_token_seconds', seconds, provider='anthropic')
+
+    def record(self, usage, label: str = ""):
+        if usage is None:
+            return
+        input_tokens = getattr(usage, 'input_tokens', 0) or 0
+        cache_creation = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        cache_read = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        output_tokens = getattr(usage, 'output_tokens', 0) or 0
+
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.cache_creation_input_tokens += cache_creation
+        self.cache_read_input_tokens += cache_read
+        self.output_tokens += output_tokens
+        for kind, count in (('input', input_tokens), ('cache_write', cache_creation),
+                            ('cache_read', cache_read), ('output', output_tokens)):
+            METRICS.incr('llm_tokens_total', count, type=kind)
+        logger.debug(f"Token usage {label}: input={input_tokens} cache_write={cache_creation} "
+                     f"cache_read={cache_read} output={output_tokens}")
+
+    def summary(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'input_tokens': self.input_tokens,
+            'cache_creation_input_tokens': self.cache_creation_input_tokens,
+            'cache_read_input_tokens': self.cache_read_input_tokens,
+            'output_tokens': self.output_tokens,
+            'mean_first_token_seconds': self.first_token_seconds / self.first_token_calls if self.first_token_calls else None,
+        }
+
+    def log_summary(self):
+        if not self.calls:
+            return
+        prompt_tokens = self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+        logger.info(f"Claude usage over {self.calls} calls: {prompt_tokens / self.calls:.0f} prompt tokens/email "
+                    f"({self.cache_read_input_tokens} read from cache), {self.output_tokens} output tokens")
+        if self.first_token_calls:
+            logger.info(f"Claude time to first token: {self.first_token_seconds / self.first_token_calls:.2f}s "
+                        f"mean over {self.first_token_calls} streamed calls")
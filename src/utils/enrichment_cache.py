@@ -0,0 +1,62 @@
+# src/utils/enrichment_cache.py
+
+import logging
+from typing import Any, Dict
+
+from src.utils.persistent_cache import MISS, PersistentCache
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+
+# Apollo search results drift as people change jobs; enriched profiles and
+# LinkedIn data change far less often.
+DEFAULT_TTL_HOURS = {
+    'apollo_search': 7 * 24,
+    'apollo_enrich': 30 * 24,
+    'proxycurl': 30 * 24,
+}
+DEFAULT_NEGATIVE_TTL_HOURS = 24
+
+
+class EnrichmentCache:
+    def __init__(self, path: str, max_entries: int = 50000, ttl_hours: Dict = None,
+                 negative_ttl_hours: float = DEFAULT_NEGATIVE_TTL_HOURS, enabled: bool = True):
+        self.enabled = enabled
+        self.ttl_hours = {**DEFAULT_TTL_HOURS, **(ttl_hours or {})}
+        self.negative_ttl_hours = negative_ttl_hours
+        self.store = PersistentCache(path, max_entries=max_entries) if enabled else None
+
+    @classmethod
+    def from_configs(cls, configs: Dict) -> "EnrichmentCache":
+        cache_configs = configs.get('enrichment_cache', {})
+        return cls(
+            path=cache_configs.get('path', '.cache/enrichment.sqlite3'),
+            max_entries=cache_configs.get('max_entries', 50000),
+            ttl_hours=cache_configs.get('ttl_hours'),
+            negative_ttl_hours=cache_configs.get('negative_ttl_hours', DEFAULT_NEGATIVE_TTL_HOURS),
+            enabled=cache_configs.get('enabled', True),
+        )
+
+    def get(self, namespace: str, key: str) -> Any:
+        if not self.enabled or not key:
+            return MISS
+        return self.store.get(namespace, key)
+
+    def set(self, namespace: str, key: str, value: Any):
+        # A falsy value records "nothing found" so we don't pay to ask again
+        # until the (shorter) negative TTL runs out.
+        if not self.enabled or not key:
+            return
+        ttl_hours = self.ttl_hours[namespace] if value else self.negative_ttl_hours
+        self.store.set(namespace, key, value or None, ttl_hours * HOUR)
+
+    def log_stats(self):
+        if not self.enabled:
+            return
+        for namespace, counts in self.store.stats().items():
+            logger.info(f"Enrichment cache {namespace}: {counts['hits']} hits, {counts['misses']} misses")
+
+    def close(self):
+        if self.enabled:
+            self.store.close()
@@ -0,0 +1,94 @@
+# src/utils/fake_batch_client.py
+
+import json
+import os
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+
+def _default_responder(params: Dict) -> str:
+    prompt = params['messages'][-1]['content']
+    if not isinstance(prompt, str):
+        prompt = " ".join(block.get('text', '') for block in prompt)
+    return f"Subject: Offline draft\n\n{prompt.strip()[:200]}"
+
+
+class _Batches:
+    def __init__(self, client: "FakeBatchClient"):
+        self._client = client
+
+    async def create(self, requests):
+        return self._client._create(requests)
+
+    async def retrieve(self, batch_id: str):
+        return self._client._retrieve(batch_id)
+
+    async def results(self, batch_id: str):
+        return self._client._results(batch_id)
+
+
+class FakeBatchClient:
+    """Offline stand-in for the Message Batches part of ``anthropic.AsyncAnthropic``.
+
+    Batches finish after ``polls_until_done`` retrieve calls. If ``state_path``
+    is set, submitted batches are kept on disk so that a new client instance,
+    as in a restarted process, can still find them.
+    """
+
+    def __init__(self, responder: Callable[[Dict], str] = _default_responder,
+                 polls_until_done: int = 1, state_path: str = None):
+        self.responder = responder
+        self.polls_until_done = polls_until_done
+        self.state_path = state_path
+        self.created = 0
+        self._batches = self._load()
+        self.messages = SimpleNamespace(batches=_Batches(self))
+
+    def _load(self) -> Dict:
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save(self):
+        if self.state_path:
+            with open(self.state_path, "w") as f:
+                json.dump(self._batches, f)
+
+    def _create(self, requests):
+        batch_id = f"msgbatch_fake_{len(self._batches) + 1}"
+        self._batches[batch_id] = {'requests': list(requests), 'polls': 0}
+        self.created += 1
+        self._save()
+        return self._retrieve(batch_id, poll=False)
+
+    def _retrieve(self, batch_id: str, poll: bool = True):
+        batch = self._batches[batch_id]
+        if poll:
+            batch['polls'] += 1
+            self._save()
+        done = batch['polls'] >= self.polls_until_done
+        total = len(batch['requests'])
+        return SimpleNamespace(
+            id=batch_id,
+            processing_status="ended" if done else "in_progress",
+            request_counts=SimpleNamespace(
+                processing=0 if done else total, succeeded=total if done else 0,
+                errored=0, canceled=0, expired=0,
+            ),
+        )
+
+    async def _results(self, batch_id: str):
+        for request in self._batches[batch_id]['requests']:
+            text = self.responder(request['params'])
+            yield SimpleNamespace(
+                custom_id=request['custom_id'],
+                result=SimpleNamespace(
+                    type="succeeded",
+                    message=SimpleNamespace(
+                        content=[SimpleNamespace(type="text", text=text)],
+                        usage=SimpleNamespace(input_tokens=0, cache_creation_input_tokens=0,
+                                              cache_read_input_tokens=0, output_tokens=len(text.split())),
+                    ),
+                ),
+            )
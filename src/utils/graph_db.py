@@ -1,66 +1,193 @@
 # src/utils/graph_db.py
 
 from neo4j import GraphDatabase
+from src.utils.normalize import parse_post_date, posting_fingerprint
+from src.utils.records import Contact
+
+DEFAULT_DRIVER_OPTIONS = {
+    'max_connection_pool_size': 50,
+    'connection_acquisition_timeout': 30.0,
+    'max_connection_lifetime': 3600,
+    'keep_alive': True,
+}
+
+def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
 
 class GraphDB:
-    def __init__(self, uri, user, password):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, batch_size=500, page_size=500, create_schema=True, **driver_options):
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.driver = GraphDatabase.driver(uri, auth=(user, password), **{**DEFAULT_DRIVER_OPTIONS, **driver_options})
+        if create_schema:
+            self.ensure_schema()
+
+    @classmethod
+    def from_configs(cls, configs):
+        neo4j_configs = dict(configs['neo4j'])
+        return cls(neo4j_configs.pop('uri'), neo4j_configs.pop('user'), neo4j_configs.pop('password'), **neo4j_configs)
 
     def close(self):
         self.driver.close()
 
-    def create_job_posting(self, job_data):
+    def ensure_schema(self):
+        statements = [
+            "CREATE CONSTRAINT job_posting_key IF NOT EXISTS FOR (j:JobPosting) REQUIRE j.key IS UNIQUE",
+            "CREATE INDEX company_name IF NOT EXISTS FOR (c:Company) ON (c.name)",
+            "CREATE INDEX job_posting_company IF NOT EXISTS FOR (j:JobPosting) ON (j.company)",
+            "CREATE INDEX job_posting_post_date IF NOT EXISTS FOR (j:JobPosting) ON (j.postDate)",
+        ]
         with self.driver.session() as session:
-            session.execute_write(self._create_job_posting, job_data)
+            for statement in statements:
+                session.run(statement).consume()
 
     @staticmethod
-    def _create_job_posting(tx, job_data):
+    def _job_posting_row(job_data):
+        return {
+            'key': posting_fingerprint(job_data),
+            'title': job_data['job_title'],
+            'company': job_data['company_name'],
+            'location': job_data['job_location'],
+            'description': job_data['job_description'],
+            'postDate': parse_post_date(job_data['job_post_date']),
+            'postDateText': job_data['job_post_date'],
+        }
+
+    @staticmethod
+    def _company_contact_row(company_name, contact_info):
+        return {
+            'company_name': company_name,
+            'properties': {
+                'email': contact_info.get('email'),
+                'position': contact_info.get('position'),
+                'confidenceScore': contact_info.get('confidence_score'),
+                'domain': contact_info.get('domain') or contact_info.get('company_domain'),
+                'firstName': contact_info.get('first_name'),
+                'lastName': contact_info.get('last_name'),
+                'source': contact_info.get('source'),
+            },
+        }
+
+    def create_job_postings(self, job_postings, batch_size=None):
+        # MERGE on the posting fingerprint makes re-ingesting a scrape a no-op
+        # instead of duplicating every node.
+        rows = [self._job_posting_row(job) for job in job_postings]
+        with self.driver.session() as session:
+            for chunk in _chunks(rows, batch_size or self.batch_size):
+                session.execute_write(self._merge_job_postings, chunk)
+        return len(rows)
+
+    @staticmethod
+    def _merge_job_postings(tx, rows):
         query = (
-            "CREATE (j:JobPosting {title: $title, company: $company, location: $location, description: $description, postDate: $postDate})"
+            "UNWIND $rows AS row "
+            "MERGE (j:JobPosting {key: row.key}) "
+            "SET j.title = row.title, j.company = row.company, j.location = row.location, "
+            "j.description = row.description, j.postDateText = row.postDateText, "
+            "j.postDate = coalesce(j.postDate, row.postDate)"
         )
-        tx.run(query, title=job_data['job_title'], company=job_data['company_name'],
-               location=job_data['job_location'], description=job_data['job_description'],
-               postDate=job_data['job_post_date'])
+        tx.run(query, rows=rows).consume()
 
-    def create_company_contact(self, company_name, contact_info):
+    @staticmethod
+    def _contact_details(contact):
+        # Contact records carry the person's fields directly; the older
+        # {company_name, contact_info} dicts nest them. None when nobody was found.
+        if isinstance(contact, Contact):
+            found = contact.email or contact.full_name or contact.linkedin_url
+            return contact.company_name, contact if found else None
+        return contact['company_name'], contact.get('contact_info') or None
+
+    def upsert_company_contacts(self, contacts, batch_size=None):
+        rows = [self._company_contact_row(company_name, contact_info)
+                for company_name, contact_info in map(self._contact_details, contacts) if contact_info is not None]
         with self.driver.session() as session:
-            session.execute_write(self._create_company_contact, company_name, contact_info)
+            for chunk in _chunks(rows, batch_size or self.batch_size):
+                session.execute_write(self._merge_company_contacts, chunk)
+        return len(rows)
 
     @staticmethod
-    def _create_company_contact(tx, company_name, contact_info):
+    def _merge_company_contacts(tx, rows):
         query = (
-            "MERGE (c:Company {name: $company_name}) "
-            "SET c.email = $email, "
-            "c.position = $position, "
-            "c.confidenceScore = $confidence_score, "
-            "c.domain = $domain, "
-            "c.firstName = $first_name, "
-            "c.lastName = $last_name, "
-            "c.source = $source"
+            "UNWIND $rows AS row "
+            "MERGE (c:Company {name: row.company_name}) "
+            "SET c += row.properties"
         )
-        tx.run(query, 
-               company_name=company_name, 
-               email=contact_info['email'],
-               position=contact_info['position'],
-               confidence_score=contact_info['confidence_score'],
-               domain=contact_info['domain'],
-               first_name=contact_info['first_name'],
-               last_name=contact_info['last_name'],
-               source=contact_info['source'])
+        tx.run(query, rows=rows).consume()
 
-    def get_job_postings(self):
+    def create_job_posting(self, job_data):
+        self.create_job_postings([job_data])
+
+    def create_company_contact(self, company_name, contact_info):
+        self.upsert_company_contacts([{'company_name': company_name, 'contact_info': contact_info}])
+
+    def _read_page(self, query, **params):
         with self.driver.session() as session:
-            result = session.run("MATCH (j:JobPosting) RETURN j")
-            return [record["j"] for record in result]
+            return session.execute_read(lambda tx: list(tx.run(query, **params)))
+
+    def iter_job_postings(self, since=None, page_size=None):
+        # Keyset pagination: each page starts strictly after the last row of the
+        # previous one, so every page is an index range scan and only one page
+        # is held in memory.
+        page_size = page_size or self.page_size
+        if since is None:
+            query = ("MATCH (j:JobPosting) WHERE j.key > $after_key "
+                     "RETURN j ORDER BY j.key LIMIT $limit")
+        else:
+            query = ("MATCH (j:JobPosting) WHERE j.postDate >= $since "
+                     "AND (j.postDate > $after_date OR (j.postDate = $after_date AND j.key > $after_key)) "
+                     "RETURN j ORDER BY j.postDate, j.key LIMIT $limit")
+        since = since.isoformat() if hasattr(since, 'isoformat') else since
+        after_date, after_key = since or "", ""
+        while True:
+            records = self._read_page(query, since=since, after_date=after_date, after_key=after_key, limit=page_size)
+            for record in records:
+                yield record["j"]
+            if len(records) < page_size:
+                return
+            after_date, after_key = records[-1]["j"].get("postDate"), records[-1]["j"]["key"]
+
+    def iter_company_contacts(self, page_size=None):
+        page_size = page_size or self.page_size
+        query = "MATCH (c:Company) WHERE c.name > $after RETURN c ORDER BY c.name LIMIT $limit"
+        after = ""
+        while True:
+            records = self._read_page(query, after=after, limit=page_size)
+            for record in records:
+                yield record["c"]
+            if len(records) < page_size:
+                return
+            after = records[-1]["c"]["name"]
+
+    def iter_companies_without_contact(self, page_size=None):
+        # Pages over distinct posting companies (via the JobPosting.company
+        # index) and keeps those with no Company node or no email on it.
+        page_size = page_size or self.page_size
+        query = (
+            "MATCH (j:JobPosting) WHERE j.company > $after "
+            "WITH DISTINCT j.company AS company ORDER BY company LIMIT $limit "
+            "OPTIONAL MATCH (c:Company {name: company}) "
+            "RETURN company, c IS NOT NULL AND c.email IS NOT NULL AS has_contact"
+        )
+        after = ""
+        while True:
+            records = self._read_page(query, after=after, limit=page_size)
+            for record in records:
+                if not record["has_contact"]:
+                    yield record["company"]
+            if len(records) < page_size:
+                return
+            after = records[-1]["company"]
+
+    def get_job_postings(self):
+        return list(self.iter_job_postings())
 
     def get_company_contacts(self):
-        with self.driver.session() as session:
-            result = session.run("MATCH (c:Company) RETURN c")
-            return [record["c"] for record in result]
+        return list(self.iter_company_contacts())
 
     def display_stored_data(self):
         print("Job Postings:")
-        for job in self.get_job_postings():
+        for job in self.iter_job_postings():
             print(f"Title: {job['title']}")
             print(f"Company: {job['company']}")
             print(f"Location: {job['location']}")
@@ -69,7 +196,7 @@ class GraphDB:
             print("---")
 
         print("\nCompany Contacts:")
-        for company in self.get_company_contacts():
+        for company in self.iter_company_contacts():
             print(f"Company: {company['name']}")
             print(f"Email: {company['email']}")
             print(f"Position: {company['position']}")
@@ -0,0 +1,141 @@
+# src/utils/indeed_parsers.py
+
+import logging
+import warnings
+
+import bs4
+from bs4 import MarkupResemblesLocatorWarning
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional; BeautifulSoup's html.parser always works
+    lxml = None
+
+# Suppress the specific BeautifulSoup warning
+warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
+
+logger = logging.getLogger(__name__)
+
+CARD_SELECTOR = "ul.css-zu9cdh li.eu4oa1w0"
+FIELDS = ("company_name", "job_title", "job_location", "job_description", "job_post_date")
+
+# Each parser returns (cards, card_count, next_page_href) where cards holds the
+# raw text fields of every job card that had all of FIELDS.
+
+
+class BeautifulSoupParser:
+    name = "bs4"
+
+    def parse(self, html):
+        soup = bs4.BeautifulSoup(html, "html.parser")
+        job_cards = soup.select(CARD_SELECTOR)
+        cards = []
+
+        for job_card in job_cards:
+            try:
+                cards.append({
+                    "company_name": job_card.select_one('[data-testid="company-name"]').text,
+                    "job_title": job_card.select_one("h2.jobTitle").text,
+                    "job_location": job_card.select_one('[data-testid="text-location"]').text,
+                    "job_description": job_card.select_one(".heading6 li").text,
+                    "job_post_date": job_card.select_one('[data-testid="myJobsStateDate"]').text,
+                })
+            except AttributeError:
+                # Silently skip this job posting if any required field is missing
+                continue
+
+        next_page_element = soup.select_one('[aria-label="Next Page"]')
+        next_page_href = next_page_element.get('href') if next_page_element else None
+        return cards, len(job_cards), next_page_href
+
+
+def _has_class(element, name):
+    return name in (element.get("class") or "").split()
+
+
+class LxmlParser:
+    name = "lxml"
+
+    _cards_xpath = (
+        "//ul[contains(concat(' ', normalize-space(@class), ' '), ' css-zu9cdh ')]"
+        "//li[contains(concat(' ', normalize-space(@class), ' '), ' eu4oa1w0 ')]"
+    )
+    _test_ids = {
+        "company-name": "company_name",
+        "text-location": "job_location",
+        "myJobsStateDate": "job_post_date",
+    }
+
+    def parse(self, html):
+        document = lxml.html.fromstring(html)
+        job_cards = document.xpath(self._cards_xpath)
+        cards = []
+
+        for job_card in job_cards:
+            # Walk the card's subtree once, picking fields off as they appear
+            # (first match wins, like select_one).
+            fields = {}
+            for element in job_card.iter():
+                if not isinstance(element.tag, str):
+                    continue
+                field = self._test_ids.get(element.get("data-testid"))
+                if field and field not in fields:
+                    fields[field] = element.text_content()
+                elif element.tag == "h2" and "job_title" not in fields and _has_class(element, "jobTitle"):
+                    fields["job_title"] = element.text_content()
+                elif "job_description" not in fields and _has_class(element, "heading6"):
+                    first_item = next(element.iter("li"), None)
+                    if first_item is not None:
+                        fields["job_description"] = first_item.text_content()
+            if len(fields) == len(FIELDS):
+                cards.append({field: fields[field] for field in FIELDS})
+
+        next_page_href = document.xpath("//*[@aria-label='Next Page']/@href")
+        return cards, len(job_cards), next_page_href[0] if next_page_href else None
+
+
+class FallbackParser:
+    """Parses with the fast backend and re-parses with BeautifulSoup when it comes up empty.
+
+    An empty result on a page that still has content usually means Indeed
+    changed its markup in a way one backend tolerates and the other doesn't.
+    """
+
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+        self._warned = False
+
+    def parse(self, html):
+        try:
+            cards, card_count, next_page_href = self.primary.parse(html)
+        except Exception as e:
+            logger.warning(f"{self.primary.name} parser failed ({str(e)}); using {self.fallback.name}")
+            return self.fallback.parse(html)
+
+        if cards or not html.strip():
+            return cards, card_count, next_page_href
+
+        fallback_result = self.fallback.parse(html)
+        if fallback_result[0] and not self._warned:
+            logger.warning(f"{self.primary.name} parser found no job cards where {self.fallback.name} did; "
+                           "the page layout may have changed")
+            self._warned = True
+        return fallback_result
+
+
+_parsers = {}
+
+
+def get_parser(name="auto"):
+    if name not in _parsers:
+        if name == "bs4" or (name == "auto" and lxml is None):
+            _parsers[name] = BeautifulSoupParser()
+        elif name == "lxml":
+            _parsers[name] = LxmlParser()
+        elif name == "auto":
+            _parsers[name] = FallbackParser(LxmlParser(), BeautifulSoupParser())
+        else:
+            raise ValueError(f"Unknown Indeed parser: {name}")
+    return _parsers[name]
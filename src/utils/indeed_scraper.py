@@ -1,91 +1,109 @@
 # src/utils/indeed_scraper.py
 
-import bs4
+import asyncio
+from contextlib import aclosing
+import httpx
 import requests
 import urllib.parse
 import logging
 import time
-import warnings
-from bs4 import MarkupResemblesLocatorWarning
-
-# Suppress the specific BeautifulSoup warning
-warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
+from src.utils.indeed_parsers import get_parser
+from src.utils.job_filters import JobFilter
+from src.utils.metrics import METRICS
+from src.utils.records import JobPosting
 
 logger = logging.getLogger(__name__)
 
-def is_location_valid(location, excluded_states):
-    try:
-        jl_subs = [x.strip() for x in location.split(",")]
-        jl_subs = [sub_elem for elem in jl_subs for sub_elem in elem.split() if sub_elem]
-    except:
-        jl_subs = []
-    return not any(state in jl_subs for state in excluded_states)
-
-def scrape_indeed(configs):
+INDEED_BASE_URL = "https://www.indeed.com/jobs?sort=date&q="
+SCRAPER_API_URL = "https://api.scraperapi.com/"
+RESULTS_PER_PAGE = 10
+
+# Set in scrape_orchestrator worker processes: a multiprocessing semaphore
+# shared by every worker so they jointly stay within the ScraperAPI plan's
+# concurrent request limit.
+scraper_api_slots = None
+
+def build_search_url(configs, start=0):
+    indeed_configs = configs['indeed']
+    url = f"{INDEED_BASE_URL}{urllib.parse.quote_plus(indeed_configs['search_query'])}"
+    if indeed_configs.get('location'):
+        url = f"{url}&l={urllib.parse.quote_plus(indeed_configs['location'])}"
+    return f"{url}&start={start}" if start else url
+
+def describe_search(indeed_configs):
+    location = indeed_configs.get('location')
+    return f"{indeed_configs['search_query']} in {location}" if location else indeed_configs['search_query']
+
+def scraper_api_url(configs):
+    return configs['indeed'].get('scraper_api_url', SCRAPER_API_URL)
+
+def scraper_api_payload(configs, url):
+    return {
+        "api_key": configs['indeed']['scraper_api_key'],
+        "url": url,
+        "premium": True,
+        "ultra_premium": True,
+    }
+
+def parse_job_cards(html, configs, job_filter=None):
+    # Pass a JobFilter built once per run; building it here recompiles per page.
+    job_filter = job_filter or JobFilter.from_configs(configs)
+    parser = get_parser(configs['indeed'].get('parser', 'auto'))
+    cards, card_count, next_page_href = parser.parse(html)
+    posts = []
+
+    for card in cards:
+        if not job_filter.matches(card):
+            continue
+
+        posts.append(JobPosting.create(source="Indeed", **card))
+
+    return next_page_href, card_count, posts
+
+def drop_seen(posts, seen, page_number):
+    # Results are sorted by date, so once a whole page is made of postings we
+    # have already processed, everything after it is older still.
+    if seen is None:
+        return posts, False
+    new_posts = seen.unseen(posts)
+    if posts and not new_posts:
+        logger.info(f"Page #{page_number} has only already-processed postings; stopping")
+        return [], True
+    return new_posts, False
+
+def scrape_indeed(configs, seen=None, on_page=None):
     logger.info("Starting Indeed Scraper")
     
-    search_query = configs['indeed']['search_query']
-    INDEED_base_url = "https://www.indeed.com/jobs?sort=date&q="
-    job_post = urllib.parse.quote_plus(search_query)
-
-    logger.info(f"Searching: {search_query}")
+    logger.info(f"Searching: {describe_search(configs['indeed'])}")
 
     indeed_posts = []
-    next_page_url = f"{INDEED_base_url}{job_post}"
+    job_filter = JobFilter.from_configs(configs)
+    next_page_url = build_search_url(configs)
     page_number = 1
 
     while next_page_url:
-        payload = {
-            "api_key": configs['indeed']['scraper_api_key'],
-            "url": next_page_url,
-            "premium": True,
-            "ultra_premium": True,
-        }
+        payload = scraper_api_payload(configs, next_page_url)
         
         try:
-            r = requests.get("https://api.scraperapi.com/", params=payload)
-            r.raise_for_status()
-            soup = bs4.BeautifulSoup(r.text, "html.parser")
-            
-            job_cards = soup.select("ul.css-zu9cdh li.eu4oa1w0")
+            with METRICS.timer('external_call', provider='scraperapi', operation='indeed_page'):
+                r = requests.get(scraper_api_url(configs), params=payload)
+                r.raise_for_status()
+            with METRICS.timer('parse', parser=configs['indeed'].get('parser', 'auto')):
+                next_page_href, _, posts = parse_job_cards(r.text, configs, job_filter)
+            posts, caught_up = drop_seen(posts, seen, page_number)
+            indeed_posts.extend(posts)
+            if on_page is not None and posts:
+                on_page(posts)
+            if caught_up:
+                break
 
             if page_number % 4 == 0:
                 logger.info(f"Scraped Up to Page #{page_number}")
 
-            for job_card in job_cards:
-                try:
-                    company_name = job_card.select_one('[data-testid="company-name"]').text
-                    job_title = job_card.select_one("h2.jobTitle").text
-                    job_location = job_card.select_one('[data-testid="text-location"]').text
-                    job_description = job_card.select_one(".heading6 li").text
-                    job_post_date = job_card.select_one('[data-testid="myJobsStateDate"]').text
-                except AttributeError:
-                    # Silently skip this job posting if any required field is missing
-                    continue
-
-                if not all(keyword.lower() in job_title.lower() for keyword in configs['indeed']['required_keywords']):
-                    continue
-
-                if not is_location_valid(job_location, configs['indeed']['states_to_exclude']):
-                    continue
-
-                indeed_posts.append({
-                    "company_name": company_name,
-                    "job_title": job_title,
-                    "job_location": job_location,
-                    "job_description": job_description,
-                    "job_post_date": job_post_date,
-                    "source": "Indeed"  # Add this line to include the source
-                })
-
             if len(indeed_posts) >= configs['indeed']['minimum_entries']:
                 break
 
-            try:
-                next_page_element = soup.select_one('[aria-label="Next Page"]')
-                next_page_url = f"https://www.indeed.com{next_page_element['href']}" if next_page_element else None
-            except:
-                next_page_url = None
+            next_page_url = f"https://www.indeed.com{next_page_href}" if next_page_href else None
 
             if next_page_url:
                 page_number += 1
@@ -101,6 +119,97 @@ def scrape_indeed(configs):
 
     return indeed_posts
 
+async def _acquire_slot():
+    # Polling rather than a blocking acquire in a thread, so a cancelled
+    # prefetch can never end up holding a slot.
+    while not scraper_api_slots.acquire(block=False):
+        await asyncio.sleep(0.05)
+
+async def _fetch_page(client, configs, start):
+    if scraper_api_slots is not None:
+        await _acquire_slot()
+    try:
+        with METRICS.timer('external_call', provider='scraperapi', operation='indeed_page'):
+            r = await client.get(scraper_api_url(configs), params=scraper_api_payload(configs, build_search_url(configs, start)))
+            r.raise_for_status()
+    finally:
+        if scraper_api_slots is not None:
+            scraper_api_slots.release()
+    return r.text
+
+async def stream_indeed_pages(configs, seen=None):
+    # Page offsets are known up front (&start=0, 10, 20, ...), so keep a window
+    # of pages in flight and parse each one, in order, while the rest download.
+    # Each page's postings are yielded as soon as it has been parsed.
+    indeed_configs = configs['indeed']
+    concurrency = indeed_configs.get('concurrency', 1)
+    max_pages = indeed_configs.get('max_pages', 50)
+    minimum_entries = indeed_configs['minimum_entries']
+
+    logger.info("Starting Indeed Scraper")
+    logger.info(f"Searching: {describe_search(indeed_configs)} ({concurrency} pages in flight)")
+
+    total_posts = 0
+    job_filter = JobFilter.from_configs(configs)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    # ScraperAPI premium rendering routinely takes tens of seconds per page.
+    async with httpx.AsyncClient(timeout=httpx.Timeout(90.0), limits=limits) as client:
+        pending = []
+        next_page = 0
+
+        def schedule():
+            nonlocal next_page
+            while len(pending) < concurrency and next_page < max_pages:
+                start = next_page * RESULTS_PER_PAGE
+                pending.append((next_page + 1, asyncio.create_task(_fetch_page(client, configs, start))))
+                next_page += 1
+
+        try:
+            schedule()
+            while pending:
+                page_number, task = pending.pop(0)
+                try:
+                    html = await task
+                except httpx.HTTPError as e:
+                    logger.error(f"Error fetching page {page_number}: {str(e)}")
+                    break
+
+                with METRICS.timer('parse', parser=indeed_configs.get('parser', 'auto')):
+                    _, card_count, posts = parse_job_cards(html, configs, job_filter)
+                posts, caught_up = drop_seen(posts, seen, page_number)
+                total_posts += len(posts)
+
+                if page_number % 4 == 0:
+                    logger.info(f"Scraped Up to Page #{page_number}")
+
+                if card_count == 0 or caught_up:
+                    break
+
+                # Start the next downloads before handing the page over, so a
+                # slow consumer never leaves the fetch window idle.
+                if total_posts < minimum_entries:
+                    schedule()
+                yield posts
+
+                if total_posts >= minimum_entries:
+                    break
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+    logger.info(f"Scraped {total_posts} Indeed Posts")
+    logger.info("Ending Indeed Scraper")
+
+async def scrape_indeed_async(configs, seen=None, on_page=None):
+    indeed_posts = []
+    async with aclosing(stream_indeed_pages(configs, seen)) as pages:
+        async for posts in pages:
+            indeed_posts.extend(posts)
+            if on_page is not None and posts:
+                on_page(posts)
+    return indeed_posts
+
 if __name__ == "__main__":
     import yaml
     with open("configs.yaml", "r") as file:
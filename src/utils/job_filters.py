@@ -0,0 +1,71 @@
+# src/utils/job_filters.py
+
+import re
+from typing import Dict, Iterable, List
+
+
+class JobFilter:
+    """Title and location filters compiled once per run and shared by every scraper.
+
+    - required_keywords: each must appear in the title (case-insensitive
+      substring), or one of its title_synonyms must.
+    - exclude_keywords: any whole-word match in the title rejects it, so
+      "intern" drops "Data Engineering Intern" but keeps "Internal Tools Engineer".
+    - states_to_exclude / zips_to_exclude: rejected when a comma/space
+      separated token of the location equals an excluded state, or is a
+      ZIP equal to (or, for 3-digit entries, starting with) an excluded one.
+    """
+
+    def __init__(self, required_keywords: Iterable[str] = (), exclude_keywords: Iterable[str] = (),
+                 title_synonyms: Dict[str, List[str]] = None, states_to_exclude: Iterable[str] = (),
+                 zips_to_exclude: Iterable[str] = ()):
+        title_synonyms = {key.lower(): values for key, values in (title_synonyms or {}).items()}
+        # One lookahead per required keyword: a single match checks them all.
+        lookaheads = []
+        for keyword in required_keywords:
+            alternatives = [keyword] + list(title_synonyms.get(keyword.lower(), []))
+            lookaheads.append(f"(?=.*?(?:{'|'.join(re.escape(word.lower()) for word in alternatives)}))")
+        self._required = re.compile("".join(lookaheads), re.DOTALL) if lookaheads else None
+
+        exclude_keywords = list(exclude_keywords)
+        self._excluded = re.compile(
+            r"\b(?:" + "|".join(re.escape(word.lower()) for word in exclude_keywords) + r")\b"
+        ) if exclude_keywords else None
+
+        zips = [str(code) for code in zips_to_exclude]
+        self.excluded_tokens = frozenset(states_to_exclude) | frozenset(code for code in zips if len(code) == 5)
+        self.zip_prefixes_to_exclude = frozenset(code for code in zips if len(code) == 3)
+
+    @classmethod
+    def from_configs(cls, configs: Dict) -> "JobFilter":
+        indeed_configs = configs['indeed']
+        return cls(
+            required_keywords=indeed_configs.get('required_keywords', []),
+            exclude_keywords=indeed_configs.get('exclude_keywords', []),
+            title_synonyms=indeed_configs.get('title_synonyms'),
+            states_to_exclude=indeed_configs.get('states_to_exclude', []),
+            zips_to_exclude=indeed_configs.get('zips_to_exclude', []),
+        )
+
+    def title_matches(self, title: str) -> bool:
+        title = (title or "").lower()
+        if self._required is not None and self._required.match(title) is None:
+            return False
+        return self._excluded is None or self._excluded.search(title) is None
+
+    def location_allowed(self, location: str) -> bool:
+        if not location or not (self.excluded_tokens or self.zip_prefixes_to_exclude):
+            return True
+        tokens = location.replace(",", " ").split()
+        if not self.excluded_tokens.isdisjoint(tokens):
+            return False
+        if self.zip_prefixes_to_exclude:
+            return not any(token[:3] in self.zip_prefixes_to_exclude
+                           for token in tokens if len(token) == 5 and token.isdigit())
+        return True
+
+    def matches(self, job: Dict) -> bool:
+        return self.title_matches(job['job_title']) and self.location_allowed(job['job_location'])
+
+    def apply(self, postings: Iterable[Dict]) -> List[Dict]:
+        return [job for job in postings if self.matches(job)]
@@ -0,0 +1,159 @@
+# src/utils/jsonl_sink.py
+
+import glob
+import gzip
+import json
+import logging
+import mmap
+import os
+import threading
+from typing import Dict, Iterable, Iterator, Optional
+
+from src.utils.records import STATE_RECORDS, to_jsonable
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_SUFFIX = ".partial"
+
+
+class JsonlSink:
+    """Append-only JSON Lines file for one kind of record in one run.
+
+    Records are written as they are produced to ``<path>.partial`` and
+    flushed every ``flush_every`` records, so a crash loses at most the
+    unflushed tail. ``close()`` renames the file into place atomically, so a
+    file without the suffix is always a complete run. Reopening the same path
+    (a resumed run) appends to the partial file.
+    """
+
+    def __init__(self, path: str, compress: bool = False, flush_every: int = None):
+        self.compress = compress
+        self.path = f"{path}.gz" if compress else path
+        self.partial_path = self.path + PARTIAL_SUFFIX
+        # A gzip flush ends a deflate block, which costs compression; batch them.
+        self.flush_every = flush_every or (100 if compress else 1)
+        self.count = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if os.path.dirname(self.partial_path):
+            os.makedirs(os.path.dirname(self.partial_path), exist_ok=True)
+        return gzip.open(self.partial_path, "ab") if self.compress else open(self.partial_path, "ab")
+
+    def write_many(self, records: Iterable):
+        lines = b"".join(json.dumps(record, default=to_jsonable).encode("utf-8") + b"\n" for record in records)
+        if not lines:
+            return
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(lines)
+            written = lines.count(b"\n")
+            if (self.count + written) // self.flush_every > self.count // self.flush_every:
+                self._file.flush()
+            self.count += written
+
+    def write(self, record):
+        self.write_many((record,))
+
+    def close(self, complete: bool = True):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+            if complete:
+                os.replace(self.partial_path, self.path)
+
+
+def output_dir(configs: Dict) -> str:
+    return configs.get('output', {}).get('dir', 'output')
+
+
+class RunOutput:
+    """The postings, contacts and emails sinks of one run."""
+
+    def __init__(self, directory: str, run_id: str, compress: bool = False, flush_every: int = None):
+        self.directory = directory
+        self.run_id = run_id
+        self.sinks = {
+            name: JsonlSink(os.path.join(directory, f"{name}-{run_id}.jsonl"), compress, flush_every)
+            for name in STATE_RECORDS
+        }
+        self.job_postings = self.sinks['job_postings']
+        self.contacts = self.sinks['contacts']
+        self.prepared_emails = self.sinks['prepared_emails']
+
+    @classmethod
+    def from_configs(cls, configs: Dict, run_id: str) -> Optional["RunOutput"]:
+        output_configs = configs.get('output', {})
+        if not output_configs.get('enabled', True):
+            return None
+        return cls(
+            output_dir(configs),
+            run_id,
+            compress=output_configs.get('compress', False),
+            flush_every=output_configs.get('flush_every'),
+        )
+
+    def close(self, complete: bool = True):
+        for sink in self.sinks.values():
+            sink.close(complete)
+        if complete:
+            logger.info(f"Run output written to {', '.join(sink.path for sink in self.sinks.values() if sink.count)}")
+
+
+def _parse_lines(lines: Iterable[bytes], path: str) -> Iterator[Dict]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Only the last line of a crashed run's partial file can be cut short.
+            logger.warning(f"Skipping truncated record in {path}")
+
+
+def iter_jsonl(path: str, name: str = None) -> Iterator:
+    """Streams the records of a sink file; ``name`` (e.g. 'contacts') decodes them into records.
+
+    Plain files are memory-mapped, so reading never copies the whole file into
+    memory; gzip files are decompressed as a stream.
+    """
+    decode = STATE_RECORDS[name].from_dict if name else None
+    if path.endswith(".gz") or path.endswith(".gz" + PARTIAL_SUFFIX):
+        with gzip.open(path, "rb") as f:
+            try:
+                for item in _parse_lines(f, path):
+                    yield decode(item) if decode else item
+            except EOFError:
+                logger.warning(f"{path} ends mid-stream; it was not closed cleanly")
+        return
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for item in _parse_lines(iter(mapped.readline, b""), path):
+                yield decode(item) if decode else item
+
+
+def latest_output(directory: str, name: str) -> Optional[str]:
+    """Path of the most recent completed sink file for ``name``, e.g. 'job_postings'."""
+    paths = glob.glob(os.path.join(directory, f"{name}-*.jsonl")) + glob.glob(os.path.join(directory, f"{name}-*.jsonl.gz"))
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def output_path(directory: str, name: str, run_id: str) -> Optional[str]:
+    """Path of the completed sink file for ``name`` in ``run_id``, plain or gzip."""
+    path = os.path.join(directory, f"{name}-{run_id}.jsonl")
+    for candidate in (path, f"{path}.gz"):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def output_run_id(path: str, name: str) -> str:
+    # output/job_postings-<run_id>.jsonl[.gz] -> <run_id>
+    return os.path.basename(path)[len(name) + 1:].split(".jsonl")[0]
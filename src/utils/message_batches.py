@@ -0,0 +1,97 @@
+# src/utils/message_batches.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Dict
+
+from src.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCheckpoint:
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self, state: Dict):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class MessageBatchRunner:
+    """Submits a set of Messages requests as one batch and waits for the results.
+
+    The batch id is checkpointed as soon as the batch is created. A restarted
+    process that submits the same requests picks the batch up again instead of
+    paying for a second one.
+    """
+
+    def __init__(self, client, checkpoint_path: str, poll_interval: float = 60.0):
+        self.client = client
+        self.checkpoint = BatchCheckpoint(checkpoint_path)
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def fingerprint(requests: Dict[str, Dict]) -> str:
+        payload = json.dumps(requests, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def _submit(self, requests: Dict[str, Dict]) -> str:
+        fingerprint = self.fingerprint(requests)
+        state = self.checkpoint.load()
+        if state.get('fingerprint') == fingerprint:
+            logger.info(f"Resuming message batch {state['batch_id']}")
+            return state['batch_id']
+
+        with METRICS.timer('external_call', provider='anthropic', operation='batch_create'):
+            batch = await self.client.messages.batches.create(
+                requests=[{"custom_id": custom_id, "params": params} for custom_id, params in requests.items()]
+            )
+        self.checkpoint.save({'batch_id': batch.id, 'fingerprint': fingerprint})
+        logger.info(f"Submitted message batch {batch.id} with {len(requests)} requests")
+        return batch.id
+
+    async def run(self, requests: Dict[str, Dict]) -> Dict:
+        if not requests:
+            return {}
+
+        batch_id = await self._submit(requests)
+        while True:
+            with METRICS.timer('external_call', provider='anthropic', operation='batch_retrieve'):
+                batch = await self.client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            counts = batch.request_counts
+            logger.info(f"Message batch {batch_id}: {counts.processing} processing, "
+                        f"{counts.succeeded} succeeded, {counts.errored} errored")
+            await asyncio.sleep(self.poll_interval)
+
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message
+            else:
+                logger.error(f"Batch request {entry.custom_id} did not succeed: {entry.result.type}")
+
+        self.checkpoint.clear()
+        return results
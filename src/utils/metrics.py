@@ -0,0 +1,192 @@
+# src/utils/metrics.py
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation.
+        target = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            if running >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 6),
+            'p95': round(self.quantile(0.95), 6),
+            'max': round(self.max, 6),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+def _label_key(labels: Dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    # The exposition format only allows \\, \" and \n escapes inside label values.
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_key: tuple, extra: Dict = None) -> str:
+    pairs = list(label_key) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(str(v))}"' for k, v in pairs) + "}"
+
+
+class Metrics:
+    """Process-wide counters and latency histograms, keyed by metric name and labels."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.counters = {}
+        self.histograms = {}
+        self.started_at = time.time()
+
+    def incr(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    def merge(self, snapshot: Dict):
+        # Folds in a snapshot() taken in another process, e.g. a scraping worker.
+        with self.lock:
+            for counter in snapshot['counters']:
+                key = (counter['name'], _label_key(counter['labels']))
+                self.counters[key] = self.counters.get(key, 0) + counter['value']
+            for entry in snapshot['histograms']:
+                key = (entry['name'], _label_key(entry['labels']))
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram()
+                histogram = self.histograms[key]
+                for index, count in enumerate(entry['buckets'].values()):
+                    histogram.counts[index] += count
+                histogram.count += entry['count']
+                histogram.sum += entry['sum']
+                histogram.max = max(histogram.max, entry['max'])
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        # Records {name}_duration_seconds, and {name}_errors_total when the block raises.
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.incr(f"{name}_errors_total", error=type(e).__name__, **labels)
+            raise
+        finally:
+            self.observe(f"{name}_duration_seconds", time.perf_counter() - started, **labels)
+
+    def retry_hook(self, provider: str, operation: str) -> Callable:
+        # For tenacity's before_sleep, which only fires when another attempt follows.
+        def before_sleep(retry_state):
+            self.incr("external_call_retries_total", provider=provider, operation=operation)
+        return before_sleep
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            histograms = [{'name': name, 'labels': dict(labels), **histogram.to_dict()}
+                          for (name, labels), histogram in sorted(self.histograms.items())]
+        return {
+            'started_at': self.started_at,
+            'wall_time_seconds': round(time.time() - self.started_at, 3),
+            'counters': counters,
+            'histograms': histograms,
+        }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self.lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (metric, labels), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    running = 0
+                    for bound, count in zip([str(b) for b in histogram.buckets] + ["+Inf"], histogram.counts):
+                        running += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, {'le': bound})} {running}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: str) -> str:
+        """Writes ``{path}.json`` and ``{path}.prom`` and returns the JSON path."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.json", "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        with open(f"{path}.prom", "w") as f:
+            f.write(self.to_prometheus())
+        return f"{path}.json"
+
+    def log_summary(self):
+        snapshot = self.snapshot()
+        for histogram in snapshot['histograms']:
+            labels = ", ".join(f"{k}={v}" for k, v in histogram['labels'].items())
+            logger.info(f"{histogram['name']} [{labels}]: {histogram['count']} calls, "
+                        f"{histogram['sum']:.1f}s total, p50 {histogram['p50']}s, p95 {histogram['p95']}s")
+
+
+METRICS = Metrics()
+
+
+def instrumented_node(name: str, run: Callable) -> Callable:
+    async def wrapper(state: Dict) -> Dict:
+        with METRICS.timer("node", node=name):
+            result = run(state)
+            if asyncio.iscoroutine(result):
+                result = await result
+        return result
+
+    return wrapper
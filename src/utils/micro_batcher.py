@@ -0,0 +1,62 @@
+# src/utils/micro_batcher.py
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, List
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collects single-key lookups from concurrent callers into bulk requests.
+
+    ``fetch(keys)`` resolves up to ``batch_size`` keys in one request and
+    returns ``{key: result}``. A batch goes out as soon as it is full, or
+    ``max_wait`` seconds after its first key arrived. Concurrent requests for
+    the same key share one slot; cancelling one of them leaves the others waiting.
+    """
+
+    def __init__(self, fetch: Callable[[List[Hashable]], Awaitable[Dict]], batch_size: int = 10,
+                 max_wait: float = 0.05):
+        self.fetch = fetch
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._pending = {}
+        self._timer = None
+        self._flushes = set()
+
+    async def get(self, key: Hashable):
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        # The future is shared by every caller waiting on this key; shield it so
+        # one caller being cancelled doesn't cancel the lookup for the others.
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            keys = list(self._pending)[:self.batch_size]
+            batch = {key: self._pending.pop(key) for key in keys}
+            task = asyncio.ensure_future(self._resolve(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _resolve(self, batch: Dict):
+        try:
+            results = await self.fetch(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
@@ -0,0 +1,47 @@
+# src/utils/normalize.py
+
+import hashlib
+import re
+import unicodedata
+from datetime import date, timedelta
+
+LEGAL_SUFFIXES = {
+    "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated",
+    "limited", "llc", "llp", "lp", "ltd", "plc",
+}
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def normalize_company_name(company_name: str) -> str:
+    text = unicodedata.normalize("NFKD", company_name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    tokens = _NON_WORD.sub(" ", text).split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def posting_fingerprint(job: dict) -> str:
+    parts = (
+        normalize_company_name(job.get('company_name', '')),
+        " ".join((job.get('job_title') or '').lower().split()),
+        " ".join((job.get('job_location') or '').lower().split()),
+    )
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+
+_DAYS_AGO = re.compile(r"(\d+)\+?\s*days?\s+ago", re.IGNORECASE)
+
+
+def parse_post_date(text: str, today: date = None) -> str:
+    # Indeed only gives relative dates ("PostedJust posted", "Posted3 days ago",
+    # "Posted30+ days ago"); pin them to a calendar day at scrape time.
+    today = today or date.today()
+    lowered = (text or "").lower()
+    if "just posted" in lowered or "today" in lowered:
+        return today.isoformat()
+    match = _DAYS_AGO.search(lowered)
+    if match:
+        return (today - timedelta(days=int(match.group(1)))).isoformat()
+    return None
@@ -0,0 +1,98 @@
+# src/utils/persistent_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict
+
+from src.utils.metrics import METRICS
+
+MISS = object()
+
+
+class PersistentCache:
+    """SQLite-backed key/value store with per-entry expiry and LRU eviction."""
+
+    def __init__(self, path: str, max_entries: int = 50000, evict_every: int = 100):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.hits = Counter()
+        self.misses = Counter()
+        self._writes = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_entries_accessed_at ON cache_entries (accessed_at)"
+        )
+
+    def get(self, namespace: str, key: str, record: bool = True) -> Any:
+        # record=False leaves the hit/miss accounting to callers that make several lookups per request.
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None or row[1] < now:
+                if record:
+                    self.misses[namespace] += 1
+                    METRICS.incr('cache_requests_total', namespace=namespace, result='miss')
+                return MISS
+            self.connection.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+        if record:
+            self.hits[namespace] += 1
+            METRICS.incr('cache_requests_total', namespace=namespace, result='hit')
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float):
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now + ttl, now),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict(now)
+
+    def delete(self, namespace: str, key: str):
+        with self.lock:
+            self.connection.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def _evict(self, now: float):
+        self.connection.execute("DELETE FROM cache_entries WHERE expires_at < ?", (now,))
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        if count > self.max_entries:
+            self.connection.execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                "SELECT rowid FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self) -> Dict:
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return {ns: {'hits': self.hits[ns], 'misses': self.misses[ns]} for ns in namespaces}
+
+    def close(self):
+        with self.lock:
+            self._evict(time.time())
+            self.connection.close()
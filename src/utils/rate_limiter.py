@@ -0,0 +1,90 @@
+# src/utils/rate_limiter.py
+
+import asyncio
+import random
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1):
+        # Holding the lock while sleeping keeps waiters FIFO instead of letting
+        # them all wake up and race for the same refill.
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class ProviderLimiter:
+    """Caps in-flight requests and request rate for a single API provider."""
+
+    def __init__(self, name: str, rate: float, burst: float, max_concurrency: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    def from_configs(cls, name: str, provider_configs: Dict, rate: float = 1.0, burst: float = 1.0,
+                     max_concurrency: int = 1) -> "ProviderLimiter":
+        return cls(
+            name,
+            rate=provider_configs.get('requests_per_second', rate),
+            burst=provider_configs.get('burst', burst),
+            max_concurrency=provider_configs.get('max_concurrency', max_concurrency),
+        )
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+
+class AdaptiveBackoff:
+    """Shared cool-down that grows on throttling responses and decays on success.
+
+    Every caller waits out the same pause, so one 429 slows the whole pool down
+    instead of each worker discovering the limit on its own.
+    """
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+        self._resume_at = 0.0
+
+    async def pause(self):
+        wait = self._resume_at - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_throttled(self, retry_after: float = None) -> float:
+        self.delay = min(self.max_delay, max(self.base_delay, self.delay * 2, retry_after or 0))
+        delay = self.delay * random.uniform(0.75, 1.25)
+        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+        return delay
+
+    def on_success(self):
+        self.delay = self.delay / 2 if self.delay > self.base_delay else 0.0
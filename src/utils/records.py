@@ -0,0 +1,153 @@
+# src/utils/records.py
+
+import json
+import sys
+from dataclasses import dataclass
+from typing import Dict, IO, Iterable, Optional
+
+from src.utils.normalize import normalize_company_name, posting_fingerprint
+
+
+def company_key(company_name: str) -> str:
+    # Every posting and contact for a company shares one key string.
+    return sys.intern(normalize_company_name(company_name))
+
+
+class Record:
+    """Base for the slotted records passed between graph nodes.
+
+    Subscript and ``get`` access mirror the dicts these records replaced, so
+    helpers such as the prompt builder and response cache accept either.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Record":
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+@dataclass(slots=True)
+class JobPosting(Record):
+    id: str
+    company_key: str
+    company_name: str
+    job_title: str
+    job_location: str
+    job_description: str
+    job_post_date: str
+    source: str = "Indeed"
+
+    @classmethod
+    def create(cls, company_name: str, job_title: str, job_location: str, job_description: str,
+               job_post_date: str, source: str = "Indeed") -> "JobPosting":
+        fields = {'company_name': company_name, 'job_title': job_title, 'job_location': job_location}
+        return cls(
+            id=posting_fingerprint(fields),
+            company_key=company_key(company_name),
+            company_name=sys.intern(company_name),
+            job_title=job_title,
+            job_location=job_location,
+            job_description=job_description,
+            job_post_date=job_post_date,
+            source=source,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "JobPosting":
+        if 'id' in data and 'company_key' in data:
+            return super(JobPosting, cls).from_dict({**data, 'company_key': sys.intern(data['company_key'])})
+        # Postings written before ids existed, e.g. an old job_posts.json.
+        return cls.create(data['company_name'], data['job_title'], data['job_location'],
+                          data['job_description'], data['job_post_date'], data.get('source', "Indeed"))
+
+
+@dataclass(slots=True)
+class Contact(Record):
+    company_key: str
+    company_name: str
+    first_name: str = ""
+    last_name: str = ""
+    full_name: str = ""
+    position: str = ""
+    email: str = ""
+    linkedin_url: str = ""
+    source: str = ""
+    country: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    industry: Optional[str] = None
+    company_domain: Optional[str] = None
+
+    @classmethod
+    def from_lookup(cls, key: str, company_name: str, contact_info: Dict) -> "Contact":
+        # contact_info is what ContactFinder returns; empty when nobody was found.
+        details = {name: contact_info[name] for name in cls.__slots__
+                   if name not in ('company_key', 'company_name') and contact_info.get(name) is not None}
+        return cls(company_key=sys.intern(key), company_name=sys.intern(company_name), **details)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Contact":
+        return cls.from_lookup(data['company_key'], data['company_name'], data)
+
+
+@dataclass(slots=True)
+class PreparedEmail(Record):
+    # The job and contact are referenced by id (JobPosting.id and
+    # Contact.company_key) rather than copied into every email.
+    job_id: str
+    contact_id: str
+    to_email: str
+    subject: str
+    content: str
+    sequence: str
+
+
+STATE_RECORDS = {
+    'job_postings': JobPosting,
+    'contacts': Contact,
+    'prepared_emails': PreparedEmail,
+}
+
+
+def to_jsonable(obj):
+    # For json.dump(s)(default=...): records are converted one at a time as
+    # the encoder reaches them, never as a whole converted copy of the state.
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def decode_state(state: Dict) -> Dict:
+    """Rebuilds records in a node result that went through JSON (e.g. a checkpoint)."""
+    return {
+        key: [STATE_RECORDS[key].from_dict(item) for item in value] if key in STATE_RECORDS else value
+        for key, value in state.items()
+    }
+
+
+def dump_json_array(records: Iterable, f: IO):
+    # Writes one record per line as it is encoded, so output never needs a
+    # second in-memory copy of the whole list.
+    f.write("[")
+    first = True
+    for record in records:
+        f.write("\n" if first else ",\n")
+        f.write(json.dumps(record, default=to_jsonable))
+        first = False
+    f.write("]\n" if first else "\n]\n")
+
+
+def index_by_id(records: Iterable[Record], key: str = 'id') -> Dict[str, Record]:
+    return {getattr(record, key): record for record in records}
@@ -0,0 +1,250 @@
+# src/utils/response_cache.py
+
+import hashlib
+import logging
+import re
+from typing import Dict, Optional
+
+from src.utils.normalize import normalize_company_name
+from src.utils.metrics import METRICS
+from src.utils.persistent_cache import MISS, PersistentCache
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+NAMESPACE = 'email_response'
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+
+_PARENTHETICAL = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def normalize_title(job_title: str) -> str:
+    # "Senior Data Engineer (Remote)" and "Senior Data Engineer - remote" are the same job.
+    title = _PARENTHETICAL.sub(" ", (job_title or "").lower())
+    words = [word for word in _WORD.findall(title) if word not in ("remote", "hybrid", "onsite")]
+    return " ".join(words)
+
+
+def simhash(text: str) -> int:
+    words = _WORD.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _personal_fields(job_posting: Dict, contact_info: Dict) -> Dict[str, str]:
+    # Longest values first so "Jane Doe" is matched before "Jane".
+    fields = {
+        'job_title': job_posting.get('job_title', ''),
+        'company_name': job_posting.get('company_name', ''),
+        'full_name': contact_info.get('full_name', ''),
+        'first_name': contact_info.get('first_name', ''),
+        'last_name': contact_info.get('last_name', ''),
+        'position': contact_info.get('position', ''),
+    }
+    return dict(sorted(((k, v.strip()) for k, v in fields.items() if v and len(v.strip()) > 1),
+                       key=lambda item: -len(item[1])))
+
+
+def _whole_words(values, flags=0) -> re.Pattern:
+    # Lookarounds rather than \b so values that start or end with punctuation
+    # ("C++ Engineer", "Acme, Inc.") are still anchored; "Al" never matches
+    # inside "Also", nor "HR" inside "HRIS".
+    return re.compile(r"(?<!\w)(?:" + "|".join(re.escape(value) for value in values) + r")(?!\w)", flags)
+
+
+def to_template(content: str, job_posting: Dict, contact_info: Dict) -> str:
+    fields = _personal_fields(job_posting, contact_info)
+    if not fields:
+        return content
+    # One pass, so a replaced value is never matched again inside a placeholder.
+    # Case-sensitive on purpose: a first name like "Will" must not eat the verb.
+    placeholders = {}
+    for field, value in fields.items():
+        placeholders.setdefault(value, f"{{{{{field}}}}}")
+    return _whole_words(placeholders).sub(lambda match: placeholders[match.group(0)], content)
+
+
+def fill_template(template: str, job_posting: Dict, contact_info: Dict) -> Optional[str]:
+    values = _personal_fields(job_posting, contact_info)
+    for field in re.findall(r"\{\{(\w+)\}\}", template):
+        if field not in values:
+            # The new contact lacks a field the template needs; generate afresh.
+            return None
+    return re.sub(r"\{\{(\w+)\}\}", lambda match: values[match.group(1)], template)
+
+
+def _identity(job_posting: Dict, contact_info: Dict) -> Dict[str, str]:
+    # What identifies the company and person an email was written for.
+    return {
+        'company_name': job_posting.get('company_name') or '',
+        'company_key': normalize_company_name(job_posting.get('company_name')),
+        'full_name': contact_info.get('full_name') or '',
+        'first_name': contact_info.get('first_name') or '',
+        'last_name': contact_info.get('last_name') or '',
+    }
+
+
+def leftover_identity(content: str, source: Dict[str, str], job_posting: Dict, contact_info: Dict) -> Optional[str]:
+    """The first value identifying ``source`` that still appears in ``content``.
+
+    The model sometimes refers to a company or person in a way the template
+    didn't capture ("Acme" for "Acme Corp", a nickname); a refilled email that
+    still names the original company or contact must not be sent to another.
+    Values shared with the new job or contact don't count.
+    """
+    current = {value.lower() for value in _identity(job_posting, contact_info).values() if value}
+    leftovers = [value.strip() for value in source.values()
+                 if value and len(value.strip()) > 1 and value.strip().lower() not in current]
+    if not leftovers:
+        return None
+    match = _whole_words(sorted(leftovers, key=len, reverse=True), re.IGNORECASE).search(content)
+    return match.group(0) if match else None
+
+
+class ResponseCache:
+    """Persistent cache of generated emails with an optional near-duplicate lookup.
+
+    Exact hits are keyed on the normalized job title, company and sequence. With
+    similarity enabled, a miss falls back to the closest earlier generation whose
+    title/description/contact signature lies within ``max_distance`` bits. Its
+    stored template is then refilled with the new contact and job fields.
+    """
+
+    def __init__(self, path: str, max_entries: int = 20000, ttl_hours: float = 30 * 24,
+                 similarity: bool = True, max_distance: int = 3, enabled: bool = True):
+        self.enabled = enabled
+        self.ttl = ttl_hours * HOUR
+        self.similarity = similarity
+        self.max_distance = max_distance
+        # One outcome per get(): an exact hit, a similar hit or a miss.
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.store = PersistentCache(path, max_entries=max_entries) if enabled else None
+        if enabled:
+            self.store.connection.execute(
+                "CREATE TABLE IF NOT EXISTS response_signatures ("
+                "key TEXT NOT NULL, sequence TEXT NOT NULL, band INTEGER NOT NULL, "
+                "band_value INTEGER NOT NULL, signature TEXT NOT NULL, PRIMARY KEY (key, band))"
+            )
+            self.store.connection.execute(
+                "CREATE INDEX IF NOT EXISTS response_signatures_band "
+                "ON response_signatures (sequence, band, band_value)"
+            )
+
+    @classmethod
+    def from_configs(cls, configs: Dict) -> "ResponseCache":
+        cache_configs = configs.get('response_cache', {})
+        return cls(
+            path=cache_configs.get('path', '.cache/responses.sqlite3'),
+            max_entries=cache_configs.get('max_entries', 20000),
+            ttl_hours=cache_configs.get('ttl_hours', 30 * 24),
+            similarity=cache_configs.get('similarity', True),
+            max_distance=cache_configs.get('max_distance', 3),
+            enabled=cache_configs.get('enabled', True),
+        )
+
+    @staticmethod
+    def exact_key(job_posting: Dict, sequence: str) -> str:
+        parts = (normalize_title(job_posting['job_title']), normalize_company_name(job_posting['company_name']), sequence)
+        return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def signature(job_posting: Dict, contact_info: Dict) -> int:
+        return simhash(" ".join((
+            normalize_title(job_posting.get('job_title')),
+            job_posting.get('job_description') or "",
+            contact_info.get('position') or "",
+        )))
+
+    def get(self, job_posting: Dict, contact_info: Dict, sequence: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        # One cache_requests_total outcome per lookup, however many rows it reads.
+        entry = self.store.get(NAMESPACE, self.exact_key(job_posting, sequence), record=False)
+        if entry is not MISS:
+            content = self._refill(entry, job_posting, contact_info)
+            if content is not None:
+                self.exact_hits += 1
+                METRICS.incr('cache_requests_total', namespace=NAMESPACE, result='hit')
+                return content
+
+        if self.similarity:
+            for key in self._similar_keys(self.signature(job_posting, contact_info), sequence):
+                entry = self.store.get(NAMESPACE, key, record=False)
+                if entry is MISS:
+                    self._forget(key)
+                    continue
+                # Entries from before sources were stored can't be checked for leftovers.
+                content = self._refill(entry, job_posting, contact_info) if 'source' in entry else None
+                if content is not None:
+                    self.similar_hits += 1
+                    METRICS.incr('cache_requests_total', namespace=NAMESPACE, result='similar_hit')
+                    return content
+        self.misses += 1
+        METRICS.incr('cache_requests_total', namespace=NAMESPACE, result='miss')
+        return None
+
+    def _refill(self, entry: Dict, job_posting: Dict, contact_info: Dict) -> Optional[str]:
+        content = fill_template(entry['template'], job_posting, contact_info)
+        if content is None:
+            return None
+        leftover = leftover_identity(content, entry.get('source', {}), job_posting, contact_info)
+        if leftover is not None:
+            logger.debug(f"Not reusing a cached email for {job_posting.get('company_name')}: it still mentions {leftover!r}")
+            return None
+        return content
+
+    def put(self, job_posting: Dict, contact_info: Dict, sequence: str, content: str):
+        if not self.enabled:
+            return
+
+        key = self.exact_key(job_posting, sequence)
+        entry = {'template': to_template(content, job_posting, contact_info),
+                 'source': _identity(job_posting, contact_info)}
+        self.store.set(NAMESPACE, key, entry, self.ttl)
+        signature = self.signature(job_posting, contact_info)
+        with self.store.lock:
+            self.store.connection.executemany(
+                "INSERT OR REPLACE INTO response_signatures (key, sequence, band, band_value, signature) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, sequence, band, signature >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1), f"{signature:016x}")
+                 for band in range(BANDS)],
+            )
+
+    def _forget(self, key: str):
+        # The response itself was evicted or expired; drop its signature too.
+        with self.store.lock:
+            self.store.connection.execute("DELETE FROM response_signatures WHERE key = ?", (key,))
+
+    def _similar_keys(self, signature: int, sequence: str):
+        # Signatures within max_distance (< BANDS) bits must agree on at least
+        # one 16-bit band, so the band index narrows the candidates.
+        bands = [(band, signature >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1)) for band in range(BANDS)]
+        with self.store.lock:
+            rows = self.store.connection.execute(
+                "SELECT DISTINCT key, signature FROM response_signatures WHERE sequence = ? AND ("
+                + " OR ".join("(band = ? AND band_value = ?)" for _ in bands) + ")",
+                [sequence] + [value for pair in bands for value in pair],
+            ).fetchall()
+        candidates = []
+        for key, stored in rows:
+            distance = bin(signature ^ int(stored, 16)).count("1")
+            if distance <= self.max_distance:
+                candidates.append((distance, key))
+        return [key for _, key in sorted(candidates)]
+
+    def log_stats(self):
+        if not self.enabled:
+            return
+        logger.info(f"Response cache: {self.exact_hits} exact hits, {self.similar_hits} similar hits, "
+                    f"{self.misses} misses")
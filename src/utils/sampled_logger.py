@@ -0,0 +1,39 @@
+# src/utils/sampled_logger.py
+
+import logging
+import threading
+from collections import Counter
+
+
+class SampledLogger:
+    """Emits the first and then every ``every``-th message per key.
+
+    Meant for per-request diagnostics that would flood the log under load.
+    Arguments are %-formatted only when a message is actually emitted, and
+    nothing is counted while the level is disabled.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = 100):
+        self.logger = logger
+        self.every = max(1, every)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: str, message: str, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        with self._lock:
+            self.counts[key] += 1
+            count = self.counts[key]
+        if count % self.every == 1 or self.every == 1:
+            suffix = f" ({count} so far, logging 1 in {self.every})" if self.every > 1 else ""
+            self.logger.log(level, message + suffix, *args)
+
+    def debug(self, key: str, message: str, *args):
+        self.log(logging.DEBUG, key, message, *args)
+
+    def info(self, key: str, message: str, *args):
+        self.log(logging.INFO, key, message, *args)
+
+    def warning(self, key: str, message: str, *args):
+        self.log(logging.WARNING, key, message, *args)
@@ -0,0 +1,82 @@
+# src/utils/scrape_orchestrator.py
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+from src.utils import indeed_scraper
+from src.utils.metrics import METRICS
+from src.utils.seen_postings import SeenPostings
+
+logger = logging.getLogger(__name__)
+
+
+def search_configs(configs: Dict) -> List[Dict]:
+    """One configs copy per entry of ``indeed.searches``.
+
+    Each search spec overrides the shared ``indeed`` settings, e.g.
+    ``{search_query: "data engineer", location: "Austin, TX", required_keywords: [data]}``.
+    Without ``searches`` the single top-level search is used as before.
+    """
+    indeed_configs = {key: value for key, value in configs['indeed'].items() if key != 'searches'}
+    searches = configs['indeed'].get('searches') or [{}]
+    return [{**configs, 'indeed': {**indeed_configs, **spec}} for spec in searches]
+
+
+def _init_worker(slots):
+    indeed_scraper.scraper_api_slots = slots
+
+
+def _scrape_search(configs: Dict):
+    # Runs in a worker process with its own event loop and connection pool.
+    METRICS.reset()
+    seen = SeenPostings.from_configs(configs)
+    try:
+        posts = asyncio.run(indeed_scraper.scrape_indeed_async(configs, seen))
+    finally:
+        if seen is not None:
+            seen.close()
+    return posts, METRICS.snapshot()
+
+
+async def scrape_searches(configs: Dict, on_postings: Callable[[List[Dict]], None] = None) -> List[Dict]:
+    searches = search_configs(configs)
+    indeed_configs = configs['indeed']
+    processes = indeed_configs.get('processes') or min(len(searches), os.cpu_count() or 1)
+    # ScraperAPI limits concurrent requests per account, not per process.
+    slots = multiprocessing.Semaphore(indeed_configs.get('scraper_api_concurrency', 10))
+
+    logger.info(f"Scraping {len(searches)} searches across {processes} processes")
+    loop = asyncio.get_running_loop()
+    merged = {}
+    scraped = 0
+    completed = 0
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(slots,)) as pool:
+        async def run(search):
+            try:
+                return search, await loop.run_in_executor(pool, _scrape_search, search)
+            except Exception as e:
+                return search, e
+
+        # Merge each search as it finishes; the same posting often matches
+        # several queries or nearby locations, so keep only its first copy.
+        for next_done in asyncio.as_completed([run(search) for search in searches]):
+            search, outcome = await next_done
+            if isinstance(outcome, Exception):
+                logger.error(f"Search {indeed_scraper.describe_search(search['indeed'])} failed: {str(outcome)}")
+                continue
+            posts, snapshot = outcome
+            METRICS.merge(snapshot)
+            new_posts = [job for job in posts if job.id not in merged]
+            merged.update((job.id, job) for job in new_posts)
+            scraped += len(posts)
+            completed += 1
+            if on_postings is not None and new_posts:
+                on_postings(new_posts)
+
+    logger.info(f"Merged {scraped} postings from {completed} searches into {len(merged)} distinct postings")
+    return list(merged.values())
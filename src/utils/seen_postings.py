@@ -0,0 +1,61 @@
+# src/utils/seen_postings.py
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+
+from src.utils.normalize import posting_fingerprint
+
+
+class SeenPostings:
+    """Durable set of posting fingerprints that have already gone downstream."""
+
+    def __init__(self, path: str = '.cache/seen_postings.sqlite3'):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen_postings (fingerprint TEXT PRIMARY KEY, first_seen REAL NOT NULL)"
+        )
+
+    @classmethod
+    def from_configs(cls, configs: Dict) -> "SeenPostings":
+        seen_configs = configs.get('seen_postings', {})
+        if not seen_configs.get('enabled', True):
+            return None
+        return cls(seen_configs.get('path', '.cache/seen_postings.sqlite3'))
+
+    def _seen(self, fingerprints: List[str]) -> set:
+        if not fingerprints:
+            return set()
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT fingerprint FROM seen_postings WHERE fingerprint IN ({','.join('?' * len(fingerprints))})",
+                fingerprints,
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def unseen(self, postings: List[Dict]) -> List[Dict]:
+        fingerprints = [posting_fingerprint(job) for job in postings]
+        seen = self._seen(fingerprints)
+        new_postings = []
+        for fingerprint, job in zip(fingerprints, postings):
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                new_postings.append(job)
+        return new_postings
+
+    def add_many(self, postings: List[Dict]):
+        now = time.time()
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO seen_postings (fingerprint, first_seen) VALUES (?, ?)",
+                [(posting_fingerprint(job), now) for job in postings],
+            )
+
+    def close(self):
+        self.connection.close()
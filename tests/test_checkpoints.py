@@ -0,0 +1,108 @@
+# tests/test_checkpoints.py
+
+import asyncio
+
+from src.utils.checkpoints import CheckpointStore, checkpointed_node
+from src.utils.persistent_cache import MISS
+
+
+def make_node(store, run_id, name, calls, failing=(), requires=(), decode=None):
+    # Processes items one by one, saving each and failing the ones in `failing`.
+    checkpoint = store.scope(run_id, name)
+
+    async def run(state):
+        done = []
+        for item in state['items']:
+            saved = checkpoint.get(item)
+            if saved is not MISS:
+                done.append(saved)
+                continue
+            calls.append(item)
+            if item in failing:
+                checkpoint.fail(item)
+                continue
+            checkpoint.put(item, item.upper())
+            done.append(item.upper())
+        return {'done': done}
+
+    return checkpointed_node(store, run_id, name, run, decode, checkpoint=checkpoint, requires=requires)
+
+
+def test_completed_node_is_restored_on_resume():
+    store = CheckpointStore(":memory:")
+    run_id = store.start_run()
+    calls = []
+
+    first = asyncio.run(make_node(store, run_id, "node", calls)({'items': ["a", "b"]}))
+    resumed = asyncio.run(make_node(store, run_id, "node", calls)({'items': ["a", "b"]}))
+
+    assert first == resumed == {'done': ["A", "B"]}
+    assert calls == ["a", "b"]
+    assert store.completed_nodes(run_id) == {"node"}
+
+
+def test_node_with_failed_items_is_not_completed_and_resume_retries_only_those():
+    store = CheckpointStore(":memory:")
+    run_id = store.start_run()
+    calls = []
+
+    first = asyncio.run(make_node(store, run_id, "node", calls, failing={"b"})({'items': ["a", "b", "c"]}))
+    assert first == {'done': ["A", "C"]}
+    assert store.completed_nodes(run_id) == set()
+
+    resumed = asyncio.run(make_node(store, run_id, "node", calls)({'items': ["a", "b", "c"]}))
+    assert resumed == {'done': ["A", "B", "C"]}
+    assert calls == ["a", "b", "c", "b"]
+    assert store.completed_nodes(run_id) == {"node"}
+
+
+def test_node_is_not_completed_while_an_upstream_node_is_incomplete():
+    store = CheckpointStore(":memory:")
+    run_id = store.start_run()
+    calls = []
+
+    asyncio.run(make_node(store, run_id, "upstream", calls, failing={"a"})({'items': ["a"]}))
+    asyncio.run(make_node(store, run_id, "downstream", calls, requires=["upstream"])({'items': ["x"]}))
+
+    assert store.completed_nodes(run_id) == set()
+
+
+def test_run_status_round_trip(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    store = CheckpointStore(path)
+    run_id = store.start_run()
+    store.finish_run(run_id, 'failed')
+    store.connection.close()
+
+    reopened = CheckpointStore(path)
+    assert reopened.run_status(run_id) == 'failed'
+    assert reopened.start_run(run_id) == run_id
+    assert reopened.run_status(run_id) == 'running'
+    assert reopened.run_status("unknown") is None
+
+
+def test_resume_after_a_crash_skips_items_finished_before_it(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    store = CheckpointStore(path)
+    run_id = store.start_run()
+    checkpoint = store.scope(run_id, "node")
+
+    async def crashing(state):
+        checkpoint.put("a", "A")
+        raise RuntimeError("killed")
+
+    try:
+        asyncio.run(checkpointed_node(store, run_id, "node", crashing, checkpoint=checkpoint)({'items': ["a", "b"]}))
+    except RuntimeError:
+        store.finish_run(run_id, 'failed')
+    store.connection.close()
+
+    reopened = CheckpointStore(path)
+    assert reopened.start_run(run_id) == run_id
+    calls = []
+    decoded = make_node(reopened, run_id, "node", calls, decode=lambda saved: {'done': tuple(saved['done'])})
+    assert asyncio.run(decoded({'items': ["a", "b"]})) == {'done': ["A", "B"]}
+    assert calls == ["b"]
+    # Once saved, the node's result is restored through decode.
+    assert asyncio.run(decoded({'items': ["a", "b"]})) == {'done': ("A", "B")}
+    assert calls == ["b"]
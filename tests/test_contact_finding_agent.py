@@ -0,0 +1,140 @@
+# tests/test_contact_finding_agent.py
+
+import asyncio
+
+import pytest
+
+from benchmarks.stub_providers import ApolloStub, Faults, ProxycurlStub, StubServer
+from src.agents.contact_finding_agent import ContactFinder, contact_finding_agent
+from src.utils.checkpoints import CheckpointStore, checkpointed_node
+from src.utils.jsonl_sink import RunOutput, iter_jsonl
+from src.utils.records import JobPosting
+
+
+@pytest.fixture
+def apollo():
+    with StubServer(ApolloStub()) as server:
+        yield server
+
+
+class ThrottleFirst(Faults):
+    # Answers the first `count` requests with a 429.
+    def __init__(self, count):
+        super().__init__(retry_after=0.01)
+        self.remaining = count
+
+    def inject(self):
+        with self._lock:
+            self.remaining -= 1
+            return 429 if self.remaining >= 0 else None
+
+
+def make_configs(apollo_url, proxycurl_url=None, **apollo_configs):
+    return {
+        'apollo_io': {'api_key': "test", 'base_url': f"{apollo_url}/v1", 'requests_per_second': 100, 'burst': 100,
+                      **apollo_configs},
+        'proxycurl': {'api_key': "test", 'base_url': f"{proxycurl_url}/proxycurl/api"},
+        'enrichment_cache': {'enabled': False},
+    }
+
+
+def make_finder(apollo_url):
+    return ContactFinder(make_configs(apollo_url))
+
+
+def test_bulk_match_keys_matches_on_their_own_id(apollo):
+    people = [apollo.provider._person(company) for company in ("Acme", "Globex", "Initech")]
+    ids = [person['id'] for person in people]
+    # Apollo leaves the middle person out; the third must not get shifted onto the second's id.
+    apollo.provider.omitted.add(ids[1])
+
+    async def run():
+        finder = make_finder(apollo.url)
+        try:
+            return await finder._apollo_bulk_match(ids)
+        finally:
+            await finder.aclose()
+
+    matches = asyncio.run(run())
+
+    assert set(matches) == {ids[0], ids[2]}
+    assert matches[ids[0]]['email'] == people[0]['email']
+    assert matches[ids[2]]['email'] == people[2]['email']
+
+
+def test_bulk_match_drops_matches_that_were_not_requested(apollo):
+    people = [apollo.provider._person(company) for company in ("Acme", "Globex")]
+
+    async def run():
+        finder = make_finder(apollo.url)
+        try:
+            return await finder._apollo_bulk_match([people[0]['id'], "unknown"])
+        finally:
+            await finder.aclose()
+
+    assert set(asyncio.run(run())) == {people[0]['id']}
+
+
+def test_throttled_apollo_calls_are_retried():
+    with StubServer(ApolloStub(ThrottleFirst(1))) as apollo:
+        async def run():
+            finder = make_finder(apollo.url)
+            try:
+                return await finder.find_contact_apollo_async("Acme")
+            finally:
+                await finder.aclose()
+
+        contact = asyncio.run(run())
+        calls = dict(apollo.provider.calls)
+
+    assert contact['email']
+    assert calls[('search', 429)] == 1 and calls[('search', 200)] == 1
+
+
+def test_a_throttled_bulk_match_is_retried_for_the_whole_batch():
+    with StubServer(ApolloStub()) as apollo:
+        ids = [apollo.provider._person(company)['id'] for company in ("Acme", "Globex", "Initech")]
+        apollo.provider.faults = ThrottleFirst(1)
+
+        async def run():
+            finder = make_finder(apollo.url)
+            try:
+                return await asyncio.gather(*(finder._apollo_enrich(person_id) for person_id in ids))
+            finally:
+                await finder.aclose()
+
+        people = asyncio.run(run())
+        calls = dict(apollo.provider.calls)
+
+    assert [person['id'] for person in people] == ids
+    assert calls == {('bulk_match', 429): 1, ('bulk_match', 200): 1}
+
+
+def test_failed_lookups_keep_the_node_incomplete_and_are_retried_on_resume(tmp_path):
+    job = JobPosting.create("Acme", "Data Engineer", "Austin, TX", "Pipelines.", "2026-10-01")
+    store = CheckpointStore(":memory:")
+    run_id = store.start_run()
+    output = RunOutput(str(tmp_path), run_id)
+
+    def run_node():
+        configs = make_configs(apollo.url, proxycurl.url, max_attempts=1)
+        checkpoint = store.scope(run_id, "find_contacts")
+        node = checkpointed_node(store, run_id, "find_contacts",
+                                 contact_finding_agent(configs, checkpoint=checkpoint, output=output),
+                                 checkpoint=checkpoint)
+        return asyncio.run(node({'job_postings': [job]})), checkpoint
+
+    with StubServer(ApolloStub(Faults(error_rate=1.0))) as apollo, StubServer(ProxycurlStub()) as proxycurl:
+        _, checkpoint = run_node()
+        assert checkpoint.failed == {job.company_key}
+        assert store.completed_nodes(run_id) == set()
+
+        apollo.provider.faults = Faults()
+        result, checkpoint = run_node()
+    output.close()
+
+    assert checkpoint.failed == set()
+    assert store.completed_nodes(run_id) == {"find_contacts"}
+    assert result['contacts'][0].email
+    # Only the lookup that succeeded reaches the contacts file.
+    assert [contact['email'] for contact in iter_jsonl(output.contacts.path)] == [result['contacts'][0].email]
@@ -0,0 +1,88 @@
+# tests/test_email_outreach_agent.py
+
+import asyncio
+
+from benchmarks.stub_providers import AnthropicStub, Faults, StubServer
+from src.agents.email_outreach_agent import EmailOutreachAgent, email_outreach_agent
+from src.utils.checkpoints import CheckpointStore, checkpointed_node
+from src.utils.records import Contact, JobPosting, decode_state
+from src.utils.seen_postings import SeenPostings
+
+JOB = JobPosting.create("Acme Corp", "Data Engineer", "Austin, TX", "Build pipelines.", "2026-10-01")
+CONTACT = Contact(company_key=JOB.company_key, company_name="Acme Corp", first_name="Jane", last_name="Doe",
+                  full_name="Jane Doe", position="Recruiter", email="jane@acme.example.com")
+
+
+def make_configs(url, tmp_path):
+    return {
+        'anthropic': {'api_key': "test", 'base_url': url, 'temperature': None, 'max_attempts': 1},
+        'email_sequences': {'initial_outreach': {}},
+        'response_cache': {'enabled': False},
+        'seen_postings': {'path': str(tmp_path / "seen.sqlite3")},
+    }
+
+
+def seen_after_run(faults, tmp_path, contacts=(CONTACT,)):
+    with StubServer(AnthropicStub(faults)) as server:
+        configs = make_configs(server.url, tmp_path)
+        result = asyncio.run(email_outreach_agent(configs)({'job_postings': [JOB], 'contacts': list(contacts)}))
+    seen = SeenPostings(configs['seen_postings']['path'])
+    try:
+        return result, seen.unseen([JOB]) == []
+    finally:
+        seen.close()
+
+
+def test_posting_is_marked_seen_once_its_email_is_prepared(tmp_path):
+    result, seen = seen_after_run(Faults(), tmp_path)
+    assert len(result['prepared_emails']) == 1
+    assert seen
+
+
+def test_posting_whose_email_failed_stays_unseen(tmp_path):
+    result, seen = seen_after_run(Faults(error_rate=1.0), tmp_path)
+    assert result['prepared_emails'] == []
+    assert not seen
+
+
+def test_posting_whose_lookup_found_nobody_is_marked_seen(tmp_path):
+    nobody = Contact(company_key=JOB.company_key, company_name=JOB.company_name)
+    result, seen = seen_after_run(Faults(), tmp_path, contacts=[nobody])
+    assert result['prepared_emails'] == []
+    assert seen
+
+
+def test_posting_whose_lookup_failed_stays_unseen(tmp_path):
+    # The contact node leaves failed lookups out of its result.
+    result, seen = seen_after_run(Faults(), tmp_path, contacts=[])
+    assert result['prepared_emails'] == []
+    assert not seen
+
+
+def test_failed_email_keeps_the_node_incomplete_until_a_resume_retries_it(tmp_path):
+    store = CheckpointStore(":memory:")
+    run_id = store.start_run()
+    state = {'job_postings': [JOB], 'contacts': [CONTACT]}
+
+    def run_node(faults):
+        with StubServer(AnthropicStub(faults)) as server:
+            checkpoint = store.scope(run_id, "prepare_emails")
+            agent = email_outreach_agent(make_configs(server.url, tmp_path), checkpoint=checkpoint)
+            node = checkpointed_node(store, run_id, "prepare_emails", agent, decode=decode_state, checkpoint=checkpoint)
+            return asyncio.run(node(state))
+
+    assert run_node(Faults(error_rate=1.0))['prepared_emails'] == []
+    assert store.completed_nodes(run_id) == set()
+
+    resumed = run_node(Faults())
+    assert [email.job_id for email in resumed['prepared_emails']] == [JOB.id]
+    assert store.completed_nodes(run_id) == {"prepare_emails"}
+
+
+def test_streamed_generation_records_time_to_first_token(tmp_path):
+    with StubServer(AnthropicStub()) as server:
+        agent = EmailOutreachAgent(make_configs(server.url, tmp_path))
+        content = asyncio.run(agent.generate_email_content_async(JOB, CONTACT, 'initial_outreach'))
+
+    assert content.startswith("Subject: Data Engineer")
+    assert agent.token_usage.first_token_calls == 1
@@ -0,0 +1,33 @@
+# tests/test_email_prompt.py
+
+from src.utils.email_prompt import EmailPromptBuilder, TokenUsage
+
+JOB = {'job_title': "Data Engineer", 'company_name': "Acme Corp", 'job_description': "word " * 2000}
+CONTACT = {'first_name': "Jane", 'last_name': "Doe", 'position': "Recruiter", 'email': "jane@acme.example.com",
+           'linkedin_url': "https://www.linkedin.com/in/jane-doe"}
+
+
+def test_prefix_below_the_cacheable_minimum_is_not_marked():
+    assert 'cache_control' not in EmailPromptBuilder().system[0]
+    assert 'cache_control' in EmailPromptBuilder(min_cache_tokens=100).system[0]
+    assert 'cache_control' not in EmailPromptBuilder(cache_prefix=False, min_cache_tokens=100).system[0]
+
+
+def test_user_prompt_keeps_contact_details_and_trims_the_description():
+    prompt = EmailPromptBuilder(description_token_budget=50).user_prompt(JOB, CONTACT, 'initial_outreach')
+    assert "Contact Email: jane@acme.example.com" in prompt
+    assert "Contact LinkedIn: https://www.linkedin.com/in/jane-doe" in prompt
+    description = next(line for line in prompt.splitlines() if line.startswith("Job Description: "))
+    assert len(description) <= len("Job Description: ") + 50 * 4 + len(" ...")
+
+
+def test_temperature_is_left_out_when_unset():
+    assert 'temperature' not in EmailPromptBuilder(temperature=None).build(JOB, CONTACT, 'initial_outreach')
+    assert EmailPromptBuilder(temperature=0.2).build(JOB, CONTACT, 'initial_outreach')['temperature'] == 0.2
+
+
+def test_first_token_times_are_averaged():
+    usage = TokenUsage()
+    usage.record_first_token(0.2)
+    usage.record_first_token(0.4)
+    assert abs(usage.summary()['mean_first_token_seconds'] - 0.3) < 1e-9
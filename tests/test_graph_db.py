@@ -0,0 +1,62 @@
+# tests/test_graph_db.py
+
+from src.utils.graph_db import GraphDB
+from src.utils.records import Contact
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.rows = []
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, work, rows):
+        self.rows.extend(rows)
+
+
+def make_db():
+    db = GraphDB("bolt://localhost:7687", "neo4j", "test", create_schema=False)
+    db.driver.close()
+    db.driver = RecordingDriver()
+    return db
+
+
+def test_upsert_company_contacts_accepts_contact_records():
+    db = make_db()
+    contacts = [
+        Contact(company_key="acme", company_name="Acme Corp", first_name="Jane", last_name="Doe",
+                full_name="Jane Doe", position="Recruiter", email="jane@acme.example.com", source="apollo",
+                company_domain="acme.example.com"),
+        # Nobody was found for this company.
+        Contact(company_key="globex", company_name="Globex"),
+    ]
+
+    assert db.upsert_company_contacts(contacts) == 1
+    assert db.driver.rows == [{
+        'company_name': "Acme Corp",
+        'properties': {
+            'email': "jane@acme.example.com",
+            'position': "Recruiter",
+            'confidenceScore': None,
+            'domain': "acme.example.com",
+            'firstName': "Jane",
+            'lastName': "Doe",
+            'source': "apollo",
+        },
+    }]
+
+
+def test_upsert_company_contacts_still_accepts_contact_info_dicts():
+    db = make_db()
+    db.create_company_contact("Acme Corp", {'email': "jane@acme.example.com", 'domain': "acme.example.com"})
+    db.upsert_company_contacts([{'company_name': "Globex", 'contact_info': {}}])
+
+    assert [row['company_name'] for row in db.driver.rows] == ["Acme Corp"]
+    assert db.driver.rows[0]['properties']['domain'] == "acme.example.com"
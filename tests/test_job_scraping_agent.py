@@ -0,0 +1,42 @@
+# tests/test_job_scraping_agent.py
+
+import argparse
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.bench_pipeline import bench_configs
+from benchmarks.stub_providers import ScraperApiStub, StubServer
+from src.agents.job_scraping_agent import job_scraping_agent
+from src.utils.jsonl_sink import RunOutput, iter_jsonl
+
+POSTINGS = 5
+LIMITS = argparse.Namespace(provider_rps=100.0, provider_concurrency=2, no_caches=True, scrape_concurrency=1)
+
+
+@pytest.fixture
+def servers():
+    server = StubServer(ScraperApiStub(total_postings=POSTINGS)).start()
+    yield {'scraperapi': server, 'apollo': server, 'proxycurl': server, 'anthropic': server}
+    server.stop()
+
+
+def test_postings_go_to_the_jsonl_output_and_no_json_array_by_default(servers, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = RunOutput(str(tmp_path / "output"), "run1")
+    result = asyncio.run(job_scraping_agent(bench_configs(POSTINGS, servers, LIMITS), output)({}))
+    output.close()
+
+    assert len(result['job_postings']) == POSTINGS
+    assert [posting['id'] for posting in iter_jsonl(output.job_postings.path)] == \
+        [posting.id for posting in result['job_postings']]
+    assert not (tmp_path / "job_posts.json").exists()
+
+
+def test_job_posts_json_is_written_when_configured(servers, tmp_path):
+    configs = {**bench_configs(POSTINGS, servers, LIMITS), 'output': {'job_posts_json': str(tmp_path / "job_posts.json")}}
+    result = asyncio.run(job_scraping_agent(configs)({}))
+
+    with open(tmp_path / "job_posts.json") as f:
+        assert json.load(f) == [posting.to_dict() for posting in result['job_postings']]
@@ -0,0 +1,68 @@
+# tests/test_jsonl_sink.py
+
+import os
+
+from src.utils.jsonl_sink import JsonlSink, RunOutput, iter_jsonl, latest_output, output_path, output_run_id
+from src.utils.records import JobPosting
+
+POSTING = JobPosting.create("Acme Corp", "Data Engineer", "Austin, TX", "Pipelines.", "2026-10-01")
+
+
+def test_records_go_to_the_partial_file_until_close(tmp_path):
+    sink = JsonlSink(str(tmp_path / "job_postings-run1.jsonl"))
+    sink.write(POSTING)
+    sink.write_many([POSTING, POSTING])
+
+    assert not os.path.exists(sink.path)
+    assert list(iter_jsonl(sink.partial_path)) == [POSTING.to_dict()] * 3
+
+    sink.close()
+    assert not os.path.exists(sink.partial_path)
+    assert list(iter_jsonl(sink.path, 'job_postings')) == [POSTING] * 3
+
+
+def test_incomplete_close_keeps_the_partial_file_and_a_reopened_sink_appends(tmp_path):
+    path = str(tmp_path / "contacts-run1.jsonl")
+    sink = JsonlSink(path)
+    sink.write({'n': 1})
+    sink.close(complete=False)
+
+    resumed = JsonlSink(path)
+    resumed.write({'n': 2})
+    resumed.close()
+
+    assert list(iter_jsonl(path)) == [{'n': 1}, {'n': 2}]
+
+
+def test_gzip_sink_round_trips(tmp_path):
+    sink = JsonlSink(str(tmp_path / "job_postings-run1.jsonl"), compress=True)
+    sink.write_many([POSTING] * 3)
+    sink.close()
+
+    assert sink.path.endswith(".jsonl.gz")
+    assert list(iter_jsonl(sink.path, 'job_postings')) == [POSTING] * 3
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / "job_postings-run1.jsonl.partial"
+    path.write_bytes(b'{"n": 1}\n{"n": 2}\n{"n"')
+
+    assert list(iter_jsonl(str(path))) == [{'n': 1}, {'n': 2}]
+
+
+def test_completed_files_are_found_by_kind_and_run(tmp_path):
+    directory = str(tmp_path)
+    output = RunOutput(directory, "run1")
+    output.job_postings.write(POSTING)
+    output.close()
+    unfinished = RunOutput(directory, "run2")
+    unfinished.job_postings.write(POSTING)
+    unfinished.close(complete=False)
+
+    path = latest_output(directory, 'job_postings')
+    assert path == output.job_postings.path
+    assert output_run_id(path, 'job_postings') == "run1"
+    assert output_path(directory, 'job_postings', "run1") == path
+    assert output_path(directory, 'job_postings', "run2") is None
+    # Sinks that never received a record don't leave empty files behind.
+    assert latest_output(directory, 'contacts') is None
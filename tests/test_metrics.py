@@ -0,0 +1,17 @@
+# tests/test_metrics.py
+
+from src.utils.metrics import Metrics
+
+
+def test_prometheus_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.incr('lookups_total', company='Say "Hi"\\Co\nLtd')
+
+    assert 'lookups_total{company="Say \\"Hi\\"\\\\Co\\nLtd"} 1' in metrics.to_prometheus()
+
+
+def test_histogram_le_label_follows_escaped_labels():
+    metrics = Metrics()
+    metrics.observe('call_duration_seconds', 0.2, provider='a"b')
+
+    assert 'call_duration_seconds_bucket{provider="a\\"b",le="+Inf"} 1' in metrics.to_prometheus()
@@ -0,0 +1,73 @@
+# tests/test_micro_batcher.py
+
+import asyncio
+
+from src.utils.micro_batcher import MicroBatcher
+
+
+def test_cancelling_one_caller_leaves_the_others_waiting():
+    async def run():
+        release = asyncio.Event()
+
+        async def fetch(keys):
+            await release.wait()
+            return {key: key.upper() for key in keys}
+
+        batcher = MicroBatcher(fetch, batch_size=10, max_wait=0.01)
+        first = asyncio.ensure_future(batcher.get("a"))
+        second = asyncio.ensure_future(batcher.get("a"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        release.set()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ("A", True)
+
+
+def test_full_batches_go_out_at_once_and_the_rest_after_max_wait():
+    async def run():
+        batches = []
+
+        async def fetch(keys):
+            batches.append(keys)
+            return {key: key * 2 for key in keys}
+
+        batcher = MicroBatcher(fetch, batch_size=3, max_wait=60)
+        full = [asyncio.ensure_future(batcher.get(key)) for key in (1, 2, 3)]
+        results = await asyncio.gather(*full)
+        # A lone key waits for the timer; a short max_wait lets it through.
+        batcher.max_wait = 0.01
+        results.append(await batcher.get(4))
+        return batches, results
+
+    assert asyncio.run(run()) == ([[1, 2, 3], [4]], [2, 4, 6, 8])
+
+
+def test_concurrent_requests_for_one_key_share_a_slot():
+    async def run():
+        batches = []
+
+        async def fetch(keys):
+            batches.append(keys)
+            return {key: key.upper() for key in keys}
+
+        batcher = MicroBatcher(fetch, batch_size=10, max_wait=0.01)
+        results = await asyncio.gather(batcher.get("a"), batcher.get("b"), batcher.get("a"))
+        return batches, results
+
+    assert asyncio.run(run()) == ([["a", "b"]], ["A", "B", "A"])
+
+
+def test_missing_keys_resolve_to_none_and_fetch_errors_reach_every_caller():
+    async def run():
+        async def fetch(keys):
+            if "boom" in keys:
+                raise RuntimeError("provider down")
+            return {}
+
+        batcher = MicroBatcher(fetch, batch_size=10, max_wait=0.01)
+        missing = await batcher.get("nobody")
+        failed = await asyncio.gather(batcher.get("boom"), batcher.get("other"), return_exceptions=True)
+        return missing, [type(e).__name__ for e in failed]
+
+    assert asyncio.run(run()) == (None, ["RuntimeError", "RuntimeError"])
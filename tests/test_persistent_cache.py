@@ -0,0 +1,36 @@
+# tests/test_persistent_cache.py
+
+from src.utils import persistent_cache
+from src.utils.persistent_cache import MISS, PersistentCache
+
+
+def test_expired_entries_are_misses():
+    cache = PersistentCache(":memory:")
+    cache.set("ns", "fresh", {'value': 1}, ttl=60)
+    cache.set("ns", "stale", {'value': 2}, ttl=-1)
+
+    assert cache.get("ns", "fresh") == {'value': 1}
+    assert cache.get("ns", "stale") is MISS
+    assert cache.stats() == {"ns": {'hits': 1, 'misses': 1}}
+
+
+def test_eviction_drops_expired_then_least_recently_used(monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(persistent_cache.time, "time", lambda: next(clock))
+    cache = PersistentCache(":memory:", max_entries=2, evict_every=1)
+    cache.set("ns", "a", 1, ttl=100)
+    cache.set("ns", "b", 2, ttl=100)
+    cache.set("ns", "expired", 3, ttl=-100)
+    cache.get("ns", "a")
+    cache.set("ns", "c", 4, ttl=100)
+
+    assert [cache.get("ns", key) for key in ("a", "b", "expired", "c")] == [1, MISS, MISS, 4]
+
+
+def test_unrecorded_lookups_leave_the_stats_alone():
+    cache = PersistentCache(":memory:")
+    cache.set("ns", "key", "value", ttl=60)
+
+    assert cache.get("ns", "key", record=False) == "value"
+    assert cache.get("ns", "other", record=False) is MISS
+    assert cache.stats() == {}
@@ -0,0 +1,65 @@
+# tests/test_rate_limiter.py
+
+import asyncio
+import time
+
+import pytest
+
+from src.utils.rate_limiter import ProviderLimiter
+
+
+def test_concurrency_is_capped():
+    async def run():
+        limiter = ProviderLimiter("apollo", rate=1000.0, burst=1000.0, max_concurrency=2)
+        in_flight = peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(8)))
+        return peak
+
+    assert asyncio.run(run()) == 2
+
+
+def test_requests_beyond_the_burst_wait_for_the_rate():
+    async def run():
+        limiter = ProviderLimiter("apollo", rate=50.0, burst=2.0, max_concurrency=10)
+
+        async def call():
+            async with limiter:
+                pass
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(6)))
+        return time.perf_counter() - started
+
+    # Two go out at once; the other four wait 1/50 s each.
+    assert asyncio.run(run()) >= 0.07
+
+
+def test_cancelled_waiter_releases_its_slot():
+    async def run():
+        limiter = ProviderLimiter("apollo", rate=1.0, burst=1.0, max_concurrency=1)
+        async with limiter:
+            pass
+        # The bucket is empty, so this waits about a second for a token.
+        waiter = asyncio.ensure_future(limiter.__aenter__())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return limiter.semaphore.locked()
+
+    assert asyncio.run(run()) is False
+
+
+def test_from_configs_falls_back_to_the_defaults():
+    limiter = ProviderLimiter.from_configs("proxycurl", {'requests_per_second': 5, 'max_concurrency': 3}, burst=4.0)
+
+    assert (limiter.bucket.rate, limiter.bucket.capacity, limiter.max_concurrency) == (5, 4.0, 3)
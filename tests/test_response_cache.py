@@ -0,0 +1,77 @@
+# tests/test_response_cache.py
+
+from src.utils.metrics import METRICS
+from src.utils.response_cache import NAMESPACE, ResponseCache, fill_template, to_template
+
+JOB = {'job_title': "Data Engineer", 'company_name': "Acme Corp",
+       'job_description': "Build batch and streaming pipelines in Python and SQL."}
+CONTACT = {'full_name': "Al Smith", 'first_name': "Al", 'last_name': "Smith", 'position': "HR"}
+OTHER_JOB = {**JOB, 'company_name': "Globex"}
+OTHER_CONTACT = {'full_name': "Jo Brown", 'first_name': "Jo", 'last_name': "Brown", 'position': "HR"}
+
+
+def test_template_replaces_whole_words_only():
+    content = "Hi Al, Also saw that HR runs HRIS at Acme Corp."
+    template = to_template(content, JOB, CONTACT)
+    assert template == "Hi {{first_name}}, Also saw that {{position}} runs HRIS at {{company_name}}."
+    assert fill_template(template, OTHER_JOB, OTHER_CONTACT) == "Hi Jo, Also saw that HR runs HRIS at Globex."
+
+
+def test_values_are_escaped_and_punctuation_edges_are_anchored():
+    job = {**JOB, 'job_title': "C++ Engineer (Remote)", 'company_name': "Acme, Inc."}
+    content = "The C++ Engineer (Remote) role at Acme, Inc. caught my eye."
+    template = to_template(content, job, CONTACT)
+    assert template == "The {{job_title}} role at {{company_name}} caught my eye."
+    assert fill_template(template, job, CONTACT) == content
+
+
+def test_fill_needs_every_placeholder():
+    assert fill_template("Hi {{first_name}}", JOB, {}) is None
+
+
+def test_similar_hit_is_refilled_for_the_new_company():
+    cache = ResponseCache(":memory:")
+    cache.put(JOB, CONTACT, 'initial_outreach', "Hi Al, the Data Engineer role at Acme Corp fits me.")
+
+    assert cache.get(OTHER_JOB, OTHER_CONTACT, 'initial_outreach') == \
+        "Hi Jo, the Data Engineer role at Globex fits me."
+    assert (cache.exact_hits, cache.similar_hits, cache.misses) == (0, 1, 0)
+
+
+def test_similar_hit_that_still_names_the_source_company_is_rejected():
+    cache = ResponseCache(":memory:")
+    # "Acme" alone isn't the templated company name, so it survives refilling.
+    cache.put(JOB, CONTACT, 'initial_outreach', "Hi Al, I've admired Acme's data platform for years.")
+
+    assert cache.get(OTHER_JOB, OTHER_CONTACT, 'initial_outreach') is None
+    assert (cache.exact_hits, cache.similar_hits, cache.misses) == (0, 0, 1)
+
+
+def test_similar_hit_that_still_names_the_source_contact_is_rejected():
+    cache = ResponseCache(":memory:")
+    cache.put(JOB, CONTACT, 'initial_outreach', "Dear Mr. SMITH, the Data Engineer role at Acme Corp fits me.")
+
+    assert cache.get(OTHER_JOB, OTHER_CONTACT, 'initial_outreach') is None
+
+
+def test_exact_hits_similar_hits_and_misses_are_counted_once_each():
+    cache = ResponseCache(":memory:", similarity=False)
+    cache.put(JOB, CONTACT, 'initial_outreach', "Hi Al, the Data Engineer role at Acme Corp fits me.")
+
+    assert cache.get(JOB, CONTACT, 'initial_outreach') is not None
+    assert cache.get(OTHER_JOB, OTHER_CONTACT, 'initial_outreach') is None
+    assert (cache.exact_hits, cache.similar_hits, cache.misses) == (1, 0, 1)
+
+
+def test_each_lookup_records_one_cache_request_outcome():
+    METRICS.reset()
+    cache = ResponseCache(":memory:")
+    cache.put(JOB, CONTACT, 'initial_outreach', "Hi Al, the Data Engineer role at Acme Corp fits me.")
+
+    cache.get(JOB, CONTACT, 'initial_outreach')
+    cache.get(OTHER_JOB, OTHER_CONTACT, 'initial_outreach')
+    cache.get({**OTHER_JOB, 'job_title': "Pastry Chef", 'job_description': "Croissants."}, OTHER_CONTACT, 'initial_outreach')
+
+    outcomes = {counter['labels']['result']: counter['value'] for counter in METRICS.snapshot()['counters']
+                if counter['name'] == 'cache_requests_total' and counter['labels']['namespace'] == NAMESPACE}
+    assert outcomes == {'hit': 1, 'similar_hit': 1, 'miss': 1}
@@ -0,0 +1,27 @@
+# tests/test_seen_postings.py
+
+from src.utils.seen_postings import SeenPostings
+
+JOB = {'company_name': "Acme Corp", 'job_title': "Data Engineer", 'job_location': "Austin, TX"}
+OTHER_JOB = {**JOB, 'job_location': "Denver, CO"}
+
+
+def test_unseen_drops_stored_and_repeated_postings():
+    seen = SeenPostings(":memory:")
+    seen.add_many([JOB])
+
+    assert seen.unseen([JOB, OTHER_JOB, dict(OTHER_JOB)]) == [OTHER_JOB]
+
+
+def test_seen_postings_survive_reopening(tmp_path):
+    path = str(tmp_path / "seen.sqlite3")
+    seen = SeenPostings(path)
+    seen.add_many([JOB, JOB])
+    seen.close()
+
+    assert SeenPostings(path).unseen([JOB, OTHER_JOB]) == [OTHER_JOB]
+
+
+def test_from_configs_can_disable_it(tmp_path):
+    assert SeenPostings.from_configs({'seen_postings': {'enabled': False}}) is None
+    assert SeenPostings.from_configs({'seen_postings': {'path': str(tmp_path / "seen.sqlite3")}}) is not None
@@ -0,0 +1,67 @@
+# tests/test_streaming_pipeline.py
+
+import argparse
+import asyncio
+import threading
+
+import pytest
+
+from benchmarks.bench_pipeline import bench_configs
+from benchmarks.stub_providers import AnthropicStub, ApolloStub, Faults, ProxycurlStub, ScraperApiStub, StubServer
+from src.agents.streaming_pipeline import run_streaming_pipeline
+
+POSTINGS = 6
+
+
+@pytest.fixture
+def servers():
+    providers = [ScraperApiStub(total_postings=POSTINGS), ApolloStub(), ProxycurlStub(), AnthropicStub()]
+    servers = {provider.name: StubServer(provider).start() for provider in providers}
+    yield servers
+    for server in servers.values():
+        server.stop()
+
+
+def test_a_failing_email_callback_does_not_stall_the_pipeline(servers):
+    limits = argparse.Namespace(provider_rps=100.0, provider_concurrency=2, no_caches=True, scrape_concurrency=1)
+    configs = bench_configs(POSTINGS, servers, limits)
+    # One email worker and no slack in the queues: if the worker died, the
+    # contact workers would block on the full `ready` queue forever.
+    configs['streaming'] = {'queue_size': 1, 'email_workers': 1}
+    delivered = []
+
+    def on_email(email):
+        if not delivered:
+            delivered.append(None)
+            raise RuntimeError("downstream sink unavailable")
+        delivered.append(email)
+
+    # A stalled pipeline can't be cancelled cleanly, so run it where a hang
+    # fails the test instead of the whole session.
+    results = []
+    runner = threading.Thread(target=lambda: results.append(asyncio.run(run_streaming_pipeline(configs, on_email))),
+                              daemon=True)
+    runner.start()
+    runner.join(timeout=30)
+
+    assert not runner.is_alive(), "pipeline stalled"
+    assert results[0]['job_postings'] == POSTINGS
+    assert len(delivered) == POSTINGS
+    assert all(email is not None for email in delivered[1:])
+
+
+def test_postings_whose_lookup_failed_are_scraped_again_next_run(servers, tmp_path):
+    limits = argparse.Namespace(provider_rps=100.0, provider_concurrency=2, no_caches=True, scrape_concurrency=1)
+    configs = bench_configs(POSTINGS, servers, limits)
+    configs['apollo_io']['max_attempts'] = 1
+    configs['seen_postings'] = {'path': str(tmp_path / "seen.sqlite3")}
+    servers['apollo'].provider.faults = Faults(error_rate=1.0)
+
+    failed = asyncio.run(run_streaming_pipeline(configs, lambda email: None))
+    servers['apollo'].provider.faults = Faults()
+    retried = asyncio.run(run_streaming_pipeline(configs, lambda email: None))
+    repeated = asyncio.run(run_streaming_pipeline(configs, lambda email: None))
+
+    assert (failed['job_postings'], failed['prepared_emails']) == (POSTINGS, 0)
+    assert (retried['job_postings'], retried['prepared_emails']) == (POSTINGS, POSTINGS)
+    assert repeated['job_postings'] == 0